@@ -1,14 +1,19 @@
 import mastermind as mm
 import random
+from array import array
+from collections import Counter
+from math import log2
 
 class Individual:
     """Represents an Individual for a genetic algorithm"""
 
+    __slots__ = ('chromosome', 'fitness')
+
     def __init__(self, chromosome: list, fitness: float):
         """Initializes an Individual for a genetic algorithm
 
         Args:
-            chromosome (list): a list representing the individual's chromosome
+            chromosome (array): the individual's chromosome, as color indices (see mm.encode_guess)
             fitness (float): the individual's fitness (the higher, the better the fitness)
         """
         self.chromosome = chromosome
@@ -23,23 +28,32 @@ class Individual:
         return f'Indiv({self.fitness:.1f},{self.chromosome})'
 
 class GASolver:
-    def __init__(self, selection_rate=0.5, mutation_rate=0.1):
-        """Initializes an instance of a GA solver for a given problem
+    def __init__(self, match, selection_rate=0.5, mutation_rate=0.1, suppress_duplicates=False,
+                 seed=None):
+        """Initializes an instance of a GA solver for the Mastermind problem
 
         Args:
+            match (mm.MastermindMatch): The match whose secret is guessed
             selection_rate (float, optional): Selection rate between 0 and 1.0. Defaults to 0.5.
             mutation_rate (float, optional): Mutation rate between 0 and 1.0. Defaults to 0.1.
+            suppress_duplicates (bool, optional): Mutate again the children identical to
+                another Individual, instead of filling the population with clones. Defaults to False.
+            seed (int, optional): Seed of the solver's random generator, for reproducible
+                runs. Defaults to None.
         """
+        self.match = match
         self._selection_rate = selection_rate
         self._mutation_rate = mutation_rate
+        self._suppress_duplicates = suppress_duplicates
+        self._rng = random.Random(seed)
         self._population = []
 
     def reset_population(self, pop_size=50):
         """Initialize the population with pop_size random Individuals"""
         self._population = []
         for _ in range(pop_size):
-            chromosome = MATCH.generate_random_guess()
-            fitness = MATCH.rate_guess(chromosome)
+            chromosome = array('B', mm.encode_guess(self.match.generate_random_guess(self._rng)))
+            fitness = self.match.rate_encoded_guess(chromosome)
             new_individual = Individual(chromosome, fitness)
             self._population.append(new_individual)
 
@@ -59,39 +73,48 @@ class GASolver:
 
         # Reproduction: Create new children
         new_population = parents.copy()
+        seen = {bytes(parent.chromosome) for parent in parents} if self._suppress_duplicates else None
         while len(new_population) < len(self._population):
-            a, b = random.sample(parents, 2)  # Select two random parents
-            x_point = random.randrange(0, len(a.chromosome))
+            a, b = self._rng.sample(parents, 2)  # Select two random parents
+            x_point = self._rng.randrange(0, len(a.chromosome))
             new_chromosome = a.chromosome[:x_point] + b.chromosome[x_point:]
-            fitness = MATCH.rate_guess(new_chromosome)
+            if seen is not None:
+                for _ in range(3):  # Mutate clones again, 3 times at most
+                    if bytes(new_chromosome) not in seen:
+                        break
+                    pos = self._rng.randrange(0, len(new_chromosome))
+                    new_chromosome[pos] = self._rng.randrange(len(mm.get_possible_colors()))
+                seen.add(bytes(new_chromosome))
+            fitness = self.match.rate_encoded_guess(new_chromosome)
             new_individual = Individual(new_chromosome, fitness)
             new_population.append(new_individual)
 
         # Mutation
         for individual in new_population[survivors:]:  # Avoid mutating parents
-            if random.random() < self._mutation_rate:
-                pos = random.randrange(0, len(individual.chromosome))
+            if self._rng.random() < self._mutation_rate:
+                pos = self._rng.randrange(0, len(individual.chromosome))
                 valid_colors = mm.get_possible_colors()
-                new_gene = random.choice(valid_colors)
-                new_chromosome = (
-                    individual.chromosome[:pos]
-                    + [new_gene]
-                    + individual.chromosome[pos + 1:]
-                )
-                individual.chromosome = new_chromosome
-                individual.fitness = MATCH.rate_guess(new_chromosome)
+                color = self._rng.randrange(len(valid_colors))
+                # Pegs score independently: only the replaced one is rescored
+                individual.fitness += self.match.peg_score(pos, color) - self.match.peg_score(pos, individual.chromosome[pos])
+                # Children are never shared, so the gene can be replaced in place
+                individual.chromosome[pos] = color
 
         self._population = new_population
 
-    def evolve_until(self, max_nb_of_generations=500, threshold_fitness=None):
+    def evolve_until(self, max_nb_of_generations=500, threshold_fitness=None, log_every=0):
         """Evolve the population until a condition is met:
         - Max number of generations is reached, or
         - A sufficiently high fitness value is achieved
+        The best fitness is printed every log_every generations (0 to stay silent)
         """
         for generation in range(max_nb_of_generations):
             self.evolve_for_one_generation()
+            if threshold_fitness is None and not log_every:
+                continue  # No need to look for the best individual
             best_individual = self.get_best_individual()
-            print(f"Generation {generation + 1}: Best fitness = {best_individual.fitness:.2f}")
+            if log_every and (generation + 1) % log_every == 0:
+                print(f"Generation {generation + 1}: Best fitness = {best_individual.fitness:.2f}")
 
             if threshold_fitness is not None and best_individual.fitness >= threshold_fitness:
                 break
@@ -99,18 +122,35 @@ class GASolver:
     def show_generation_summary(self):
         """Print some debug information on the current state of the population"""
         best = self.get_best_individual()
-        print(f"Best individual: {best}")
+        unique, entropy = self.get_diversity()
+        print(f"Best individual: {best}, {unique} distinct chromosomes, gene entropy {entropy:.2f}")
+
+    def get_diversity(self):
+        """Return the number of distinct chromosomes of the population, and the
+        mean over the gene positions of the entropy (in bits) of their genes"""
+        unique = len({bytes(individual.chromosome) for individual in self._population})
+        entropy = 0.0
+        for genes in zip(*(individual.chromosome for individual in self._population)):
+            for count in Counter(genes).values():
+                p = count / len(self._population)
+                entropy -= p * log2(p)
+        return unique, entropy / len(self._population[0].chromosome)
 
     def get_best_individual(self):
         """Return the best Individual of the population"""
         return max(self._population, key=lambda ind: ind.fitness)
 
+    def get_best_guess(self):
+        """Return the chromosome of the best Individual as a list of colors"""
+        return mm.decode_guess(self.get_best_individual().chromosome)
+
 # Main code to solve the Mastermind problem
-MATCH = mm.MastermindMatch(secret_size=4)
-solver = GASolver()
-solver.reset_population()
-solver.evolve_until(threshold_fitness=MATCH.max_score())
-
-best = solver.get_best_individual()
-print(f"Best guess: {best.chromosome}")
-print(f"Problem solved? {MATCH.is_correct(best.chromosome)}")
\ No newline at end of file
+if __name__ == '__main__':
+    match = mm.MastermindMatch(secret_size=4)
+    solver = GASolver(match, suppress_duplicates=True)
+    solver.reset_population()
+    solver.evolve_until(threshold_fitness=match.max_score(), log_every=10)
+
+    best_guess = solver.get_best_guess()
+    print(f"Best guess: {best_guess}")
+    print(f"Problem solved? {match.is_correct(best_guess)}")
\ No newline at end of file
@@ -0,0 +1 @@
+"""Lab part 1: the Mastermind game (mastermind) and its solvers"""
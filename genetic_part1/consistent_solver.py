@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Mastermind solver working from the standard black/white peg feedback
+(MastermindMatch.feedback) instead of rate_guess scores.
+
+All the possible codes are enumerated once as a compact integer array; the
+solver keeps the identifiers of the codes still consistent with every
+feedback received so far, and chooses its next guess with one of three
+strategies:
+- 'consistent': any code of the consistent set (cheapest),
+- 'minimax': Knuth's strategy, the guess whose worst feedback leaves the
+  fewest consistent codes,
+- 'ga': a small genetic search restricted to the consistent set, maximizing
+  the number of distinct feedbacks a guess can receive.
+Partition sizes are estimated on a random sample of the consistent set when
+it is large, so each guess costs at most max_candidates * sample_size
+vectorized feedback computations.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+from . import mastermind as mm
+
+
+class FeedbackIndex:
+    """Set of the codes still consistent with the feedback received so far,
+    indexed by the feedback they would give to a guess"""
+
+    def __init__(self, secret_size: int, nb_colors: int):
+        """Enumerates all the codes of a given size
+
+        Args:
+            secret_size (int): number of pegs of a code
+            nb_colors (int): number of possible colors of a peg
+        """
+        self.secret_size = secret_size
+        self.nb_colors = nb_colors
+        nb_codes = nb_colors ** secret_size
+        identifiers = np.arange(nb_codes)
+        # Code k has the digits of k in base nb_colors, most significant first
+        self.codes = np.empty((nb_codes, secret_size), dtype=np.uint8)
+        for peg in range(secret_size):
+            self.codes[:, peg] = identifiers // nb_colors ** (secret_size - 1 - peg) % nb_colors
+        self.color_counts = np.empty((nb_codes, nb_colors), dtype=np.uint8)
+        for color in range(nb_colors):
+            self.color_counts[:, color] = (self.codes == color).sum(axis=1)
+        self.consistent = identifiers
+        self._consistent_mask = np.ones(nb_codes, dtype=bool)
+
+    def __len__(self):
+        """Number of codes still consistent"""
+        return len(self.consistent)
+
+    def identifier(self, code) -> int:
+        """Identifier of a code (its index in the codes array)"""
+        identifier = 0
+        for color in code:
+            identifier = identifier * self.nb_colors + int(color)
+        return identifier
+
+    def is_consistent(self, identifiers) -> np.ndarray:
+        """Whether each code identifier is still consistent"""
+        return self._consistent_mask[identifiers]
+
+    def responses(self, guess, identifiers=None) -> np.ndarray:
+        """Feedback (encoded as black * (secret_size + 1) + white) that each
+        code would give to a guess
+
+        Args:
+            guess (sequence[int]): an encoded guess
+            identifiers (numpy.ndarray, optional): the codes to consider.
+                Defaults to all the consistent codes.
+        """
+        if identifiers is None:
+            identifiers = self.consistent
+        guess = np.asarray(guess, dtype=np.uint8)
+        guess_counts = np.bincount(guess, minlength=self.nb_colors).astype(np.uint8)
+        black = (self.codes[identifiers] == guess).sum(axis=1)
+        common = np.minimum(self.color_counts[identifiers], guess_counts).sum(axis=1, dtype=np.intp)
+        return black * (self.secret_size + 1) + (common - black)
+
+    def partition_sizes(self, guess, identifiers=None) -> np.ndarray:
+        """Number of codes giving each possible feedback to a guess"""
+        return np.bincount(self.responses(guess, identifiers),
+                           minlength=(self.secret_size + 1) ** 2)
+
+    def restrict(self, guess, feedback: Tuple[int, int]):
+        """Keep only the codes that would have given this feedback to the guess"""
+        black, white = feedback
+        kept = self.responses(guess) == black * (self.secret_size + 1) + white
+        self._consistent_mask[self.consistent[~kept]] = False
+        self.consistent = self.consistent[kept]
+
+
+class ConsistentSetSolver:
+    STRATEGIES = ('consistent', 'minimax', 'ga')
+
+    def __init__(self, match: mm.MastermindMatch, strategy='minimax',
+                 max_candidates=500, sample_size=2000, seed=None):
+        """Initializes a solver for a given match
+
+        Args:
+            match (mm.MastermindMatch): the match to solve, only queried through
+                its feedback method
+            strategy (str, optional): 'consistent', 'minimax' or 'ga'. Defaults to 'minimax'.
+            max_candidates (int, optional): number of guesses compared by the
+                'minimax' and 'ga' strategies. Defaults to 500.
+            sample_size (int, optional): number of consistent codes on which the
+                partition sizes are estimated. Defaults to 2000.
+            seed (int, optional): seed of the random generator. Defaults to None.
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {self.STRATEGIES}")
+        self.match = match
+        self.strategy = strategy
+        self._max_candidates = max_candidates
+        self._sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self.index = FeedbackIndex(match.secret_size(), len(mm.get_possible_colors()))
+        self.history = []  # (encoded guess, feedback) of each guess made
+
+    def solve(self, max_guesses=50) -> List[str]:
+        """Guess until the secret is found or max_guesses guesses were made
+
+        Returns:
+            list[str]: the last guess, as a list of color strings
+        """
+        guess = None
+        for _ in range(max_guesses):
+            guess = self.next_guess()
+            feedback = self.match.feedback(guess)
+            self.history.append((guess, feedback))
+            if feedback[0] == self.index.secret_size:
+                break
+            self.index.restrict(guess, feedback)
+        return mm.decode_guess(guess)
+
+    def next_guess(self) -> np.ndarray:
+        """Choose the next guess, as an array of color indices"""
+        index = self.index
+        if len(index) == 1 or self.strategy == 'consistent':
+            return index.codes[self._rng.choice(index.consistent)]
+        if not self.history:
+            # Knuth's opening, generalized: pairs of colors (1122 for 4 pegs)
+            return np.arange(index.secret_size, dtype=np.uint8) // 2 % index.nb_colors
+        if self.strategy == 'minimax':
+            return self._minimax_guess()
+        return self._ga_guess()
+
+    def _sample(self, size):
+        """Identifiers of at most size random consistent codes"""
+        consistent = self.index.consistent
+        if len(consistent) <= size:
+            return consistent
+        return self._rng.choice(consistent, size, replace=False)
+
+    def _minimax_guess(self):
+        """The candidate whose largest feedback partition is the smallest,
+        preferring consistent candidates on ties"""
+        index = self.index
+        sample = self._sample(self._sample_size)
+        candidates = self._sample(self._max_candidates)
+        if len(index) < len(index.codes):
+            # Inconsistent codes can split the set better (Knuth), try some too
+            others = self._rng.integers(0, len(index.codes), self._max_candidates // 4)
+            candidates = np.concatenate((candidates, others))
+        worst = np.array([index.partition_sizes(index.codes[c], sample).max() for c in candidates])
+        consistent = index.is_consistent(candidates)
+        best = np.lexsort((~consistent, worst))[0]
+        return index.codes[candidates[best]]
+
+    def _ga_guess(self, generations=5):
+        """Evolve guesses of the consistent set towards the most distinct
+        feedbacks (the 'most parts' criterion)"""
+        index = self.index
+        sample = self._sample(self._sample_size)
+
+        def fitness(identifiers):
+            return np.array([np.count_nonzero(index.partition_sizes(index.codes[i], sample))
+                             for i in identifiers])
+
+        pop_size = min(len(index), max(2, self._max_candidates // generations))
+        population = self._sample(pop_size)
+        scores = fitness(population)
+        for _ in range(generations):
+            # Uniform crossover between random parents, then one mutated peg
+            parents = index.codes[population[self._rng.integers(0, len(population), (pop_size, 2))]]
+            mask = self._rng.random((pop_size, index.secret_size)) < 0.5
+            children = np.where(mask, parents[:, 0], parents[:, 1])
+            pegs = self._rng.integers(0, index.secret_size, pop_size)
+            children[np.arange(pop_size), pegs] = self._rng.integers(0, index.nb_colors, pop_size)
+            weights = index.nb_colors ** np.arange(index.secret_size - 1, -1, -1)
+            children = np.unique(children.astype(np.int64) @ weights)
+            children = children[index.is_consistent(children)]  # Stay in the consistent set
+            children = np.setdiff1d(children, population)
+            if len(children) == 0:
+                continue
+            population = np.concatenate((population, children))
+            scores = np.concatenate((scores, fitness(children)))
+            survivors = np.argsort(-scores, kind='stable')[:pop_size]
+            population, scores = population[survivors], scores[survivors]
+        return index.codes[population[np.argmax(scores)]]
+
+
+if __name__ == '__main__':
+    for secret_size in range(4, 7):
+        for strategy in ConsistentSetSolver.STRATEGIES:
+            match = mm.MastermindMatch(secret_size=secret_size)
+            solver = ConsistentSetSolver(match, strategy)
+            guess = solver.solve()
+            print(f"secret_size={secret_size} {strategy:10} guesses={len(solver.history)} "
+                  f"solved={match.is_correct(guess)}")
@@ -11,8 +11,10 @@ a match of the game having a certain secret code generated at random.
 This class plays the role of the codemaker, allowing to check if a guess
 is correct and rating how close a guess is to the secret code.
 """
-from random import choice
-from typing import List
+import random
+from typing import Iterable, List, Tuple
+
+import numpy as np
 
 # Possible colors for codes in in the game
 _colors = ['blue', 'red', 'green', 'yellow', 'orange', 'violet']
@@ -24,9 +26,11 @@ def get_possible_colors():
     return _colors
 
 
-def generate_random_secret(size) -> List[str]:
-    """Generate a random secret of a given size"""
-    secret = [choice(_colors) for _ in range(size)]
+def generate_random_secret(size, rng=None) -> List[str]:
+    """Generate a random secret of a given size, with the random generator
+    rng (the random module by default)"""
+    rng = rng or random
+    secret = [rng.choice(_colors) for _ in range(size)]
     return secret
 
 
@@ -40,7 +44,8 @@ class MastermindMatch:
     def __init__(self,
                  secret_size=4,
                  correct_color_points=1,
-                 correct_position_points=3):
+                 correct_position_points=3,
+                 rng=None):
         """Instantiates a mastermind guess with a random secret code
 
         A match can be created by calling:
@@ -53,8 +58,17 @@ class MastermindMatch:
             color at the wrong position. Defaults to 1.
             correct_position_points (int, optional): points awarded for a
             correct color at the right position. Defaults to 3.
+            rng (random.Random, optional): random generator drawing the
+            secret. Defaults to the random module.
         """
-        self._secret = generate_random_secret(secret_size)
+        self._secret = generate_random_secret(secret_size, rng)
+        self._secret_colors = set(self._secret)
+        # Integer scoring kernel: encoded secret and histogram of its colors
+        self._encoded_secret = np.array(encode_guess(self._secret), dtype=np.intp)
+        self._color_counts = np.bincount(self._encoded_secret, minlength=len(_colors))
+        self._color_present = self._color_counts > 0
+        self._present = self._color_present.tolist()  # For fast scalar lookups
+        self._secret_list = self._encoded_secret.tolist()
         self.correct_color_points = correct_color_points
         self.correct_position_points = correct_position_points
 
@@ -69,8 +83,8 @@ class MastermindMatch:
         """
         return guess == self._secret
 
-    def generate_random_guess(self):
-        return generate_random_secret(len(self._secret))
+    def generate_random_guess(self, rng=None):
+        return generate_random_secret(len(self._secret), rng)
 
     def rate_guess(self, guess: List[str]):
         """Gives a numeric score for a given guess proportional to how close
@@ -87,12 +101,88 @@ class MastermindMatch:
         for i, color in enumerate(guess):
             if self._secret[i] == color:
                 correct_position += 1
-            elif color in self._secret:
+            elif color in self._secret_colors:
                 correct_colors += 1
         score = correct_colors*self.correct_color_points + \
             correct_position * self.correct_position_points
         return score
 
+    def rate_encoded_guess(self, guess: Iterable[int]):
+        """Same as rate_guess, for a guess encoded with encode_guess
+
+        Args:
+            guess (iterable[int]): a mastermind guess as a sequence of color
+            indices
+
+        Returns:
+            int or float: the computed score
+        """
+        secret = self._secret_list
+        present = self._present
+        correct_position = 0
+        correct_colors = 0
+        for i, color in enumerate(guess):
+            if secret[i] == color:
+                correct_position += 1
+            elif present[color]:
+                correct_colors += 1
+        score = correct_colors*self.correct_color_points + \
+            correct_position * self.correct_position_points
+        return score
+
+    def peg_score(self, position: int, color: int):
+        """Points given by rate_encoded_guess to a single peg: pegs score
+        independently, so a guess score is the sum of its peg scores
+
+        Args:
+            position (int): the position of the peg
+            color (int): its color index
+
+        Returns:
+            int or float: the points of the peg
+        """
+        if self._secret_list[position] == color:
+            return self.correct_position_points
+        if self._present[color]:
+            return self.correct_color_points
+        return 0
+
+    def rate_guesses(self, guesses) -> np.ndarray:
+        """Same as rate_encoded_guess, for a whole batch of encoded guesses
+        at once
+
+        Args:
+            guesses (array-like): a 2-D integer array with one encoded guess
+            per row
+
+        Returns:
+            numpy.ndarray: the score of each guess
+        """
+        guesses = np.asarray(guesses, dtype=np.intp)
+        correct_position = guesses == self._encoded_secret
+        correct_colors = self._color_present[guesses] & ~correct_position
+        return correct_colors.sum(axis=1)*self.correct_color_points + \
+            correct_position.sum(axis=1)*self.correct_position_points
+
+    def feedback(self, guess: Iterable[int]) -> Tuple[int, int]:
+        """Gives the standard mastermind feedback for an encoded guess
+
+        Args:
+            guess (iterable[int]): a mastermind guess as a sequence of color
+            indices
+
+        Returns:
+            tuple[int, int]: the number of pegs of the right color at the
+            right position (black pegs), and the number of other pegs of a
+            color of the secret, each secret peg being matched at most once
+            (white pegs)
+        """
+        guess = np.asarray(guess, dtype=np.intp)
+        black = int((guess == self._encoded_secret).sum())
+        guess_counts = np.bincount(guess, minlength=len(_colors))
+        common = int(np.minimum(guess_counts, self._color_counts).sum())
+        return black, common - black
+
     def secret_size(self):
         """Returns the size of the secret code"""
         return len(self._secret)
@@ -114,3 +204,16 @@ def encode_guess(guess: List[str]) -> List[int]:
         list[int]: a mastermind guess as a list of integers
     """
     return [_colors_to_int[c] for c in guess]
+
+
+def decode_guess(guess: Iterable[int]) -> List[str]:
+    """Decode a guess encoded with encode_guess back to a list of color
+    strings
+
+    Args:
+        guess (iterable[int]): a mastermind guess as a sequence of integers
+
+    Returns:
+        list[str]: a mastermind guess as a list of color strings
+    """
+    return [_colors[i] for i in guess]
@@ -1,14 +1,19 @@
 import cities
 import random
+from array import array
+from collections import Counter
+from math import log2
 
 class Individual:
     """Represents an Individual for a genetic algorithm"""
 
+    __slots__ = ('chromosome', 'fitness')
+
     def __init__(self, chromosome: list, fitness: float):
         """Initializes an Individual for a genetic algorithm
 
         Args:
-            chromosome (list): a list representing the individual's chromosome
+            chromosome (array): the individual's chromosome, as city positions (see cities.DistanceIndex)
             fitness (float): the individual's fitness (higher is better)
         """
         self.chromosome = chromosome
@@ -23,26 +28,49 @@ class Individual:
         return f'Indiv({self.fitness:.1f},{self.chromosome})'
 
 class GASolver:
-    def __init__(self, city_dict, selection_rate=0.5, mutation_rate=0.1):
+    def __init__(self, city_dict, selection_rate=0.5, mutation_rate=0.1, suppress_duplicates=False,
+                 seed=None):
         """Initializes an instance of a GA solver for the TSP problem
 
         Args:
             city_dict (dict): A dictionary of cities with coordinates
             selection_rate (float, optional): Selection rate between 0 and 1.0. Defaults to 0.5.
             mutation_rate (float, optional): Mutation rate between 0 and 1.0. Defaults to 0.1.
+            suppress_duplicates (bool, optional): Mutate again the children identical to
+                another Individual, instead of filling the population with clones. Defaults to False.
+            seed (int, optional): Seed of the solver's random generator, for reproducible
+                runs. Defaults to None.
         """
         self.city_dict = city_dict
+        self._distances = cities.DistanceIndex(city_dict)  # Computed once, cities become integers
+        self._typecode = 'H' if len(city_dict) <= 0x10000 else 'I'  # Smallest unsigned type that fits
         self._selection_rate = selection_rate
         self._mutation_rate = mutation_rate
+        self._suppress_duplicates = suppress_duplicates
+        self._rng = random.Random(seed)
         self._population = []
+        self._spatial_index = None  # Built for nearest neighbour roads only
+
+    def reset_population(self, pop_size=50, nearest_neighbour=False):
+        """Initialize the population with pop_size random Individuals
 
-    def reset_population(self, pop_size=50):
-        """Initialize the population with pop_size random Individuals"""
+        Args:
+            pop_size (int, optional): number of Individuals. Defaults to 50.
+            nearest_neighbour (bool, optional): start from nearest neighbour
+                roads (from random start cities) instead of shuffled roads,
+                much shorter on large instances. Defaults to False.
+        """
         self._population = []
+        if nearest_neighbour and self._spatial_index is None:
+            self._spatial_index = cities.SpatialIndex(self.city_dict)
         for _ in range(pop_size):
-            chromosome = cities.default_road(self.city_dict)
-            random.shuffle(chromosome)  # Shuffle for randomness
-            fitness = -cities.road_length(self.city_dict, chromosome)  # Negative length as fitness
+            if nearest_neighbour:
+                start = self._rng.randrange(len(self._distances))
+                chromosome = array(self._typecode, self._spatial_index.nearest_neighbour_road(start))
+            else:
+                chromosome = array(self._typecode, range(len(self._distances)))
+                self._rng.shuffle(chromosome)  # Shuffle for randomness
+            fitness = -self._distances.road_length(chromosome)  # Negative length as fitness
             new_individual = Individual(chromosome, fitness)
             self._population.append(new_individual)
 
@@ -62,55 +90,87 @@ class GASolver:
 
         # Reproduction: Create new children
         new_population = parents.copy()
+        seen = {bytes(parent.chromosome) for parent in parents} if self._suppress_duplicates else None
         while len(new_population) < len(self._population):
-            a, b = random.sample(parents, 2)  # Select two random parents
+            a, b = self._rng.sample(parents, 2)  # Select two random parents
 
             # Reproduce with crossover
-            x_point = random.randint(1, len(a.chromosome) - 1)  # Avoid empty splits
+            x_point = self._rng.randint(1, len(a.chromosome) - 1)  # Avoid empty splits
             child_chromosome = a.chromosome[:x_point]
-            child_chromosome += [city for city in b.chromosome if city not in child_chromosome]
-
-            fitness = -cities.road_length(self.city_dict, child_chromosome)
+            taken = bytearray(len(a.chromosome))  # Lookup table: no search in the child
+            for city in child_chromosome:
+                taken[city] = 1
+            child_chromosome.extend(city for city in b.chromosome if not taken[city])
+            if seen is not None:
+                for _ in range(3):  # Mutate clones again, 3 times at most
+                    if bytes(child_chromosome) not in seen:
+                        break
+                    i, j = self._rng.sample(range(len(child_chromosome)), 2)
+                    child_chromosome[i], child_chromosome[j] = child_chromosome[j], child_chromosome[i]
+                seen.add(bytes(child_chromosome))
+
+            fitness = -self._distances.road_length(child_chromosome)
             new_individual = Individual(child_chromosome, fitness)
             new_population.append(new_individual)
 
         # Mutation
         for individual in new_population[survivors:]:  # Avoid mutating parents
-            if random.random() < self._mutation_rate:
-                i, j = random.sample(range(len(individual.chromosome)), 2)
+            if self._rng.random() < self._mutation_rate:
+                i, j = self._rng.sample(range(len(individual.chromosome)), 2)
+                # Only the edges around i and j change, no need to measure the whole road
+                individual.fitness -= self._distances.swap_delta(individual.chromosome, i, j)
                 individual.chromosome[i], individual.chromosome[j] = (
                     individual.chromosome[j],
                     individual.chromosome[i],
                 )
-                individual.fitness = -cities.road_length(self.city_dict, individual.chromosome)
 
         self._population = new_population
 
-    def evolve_until(self, max_nb_of_generations=500):
-        """Evolve the population for a set number of generations"""
+    def evolve_until(self, max_nb_of_generations=500, log_every=0):
+        """Evolve the population for a set number of generations, printing
+        the best fitness every log_every generations (0 to stay silent)"""
         for generation in range(max_nb_of_generations):
             self.evolve_for_one_generation()
-            best_individual = self.get_best_individual()
-            print(f"Generation {generation + 1}: Best fitness = {best_individual.fitness:.2f}")
+            if log_every and (generation + 1) % log_every == 0:
+                best_individual = self.get_best_individual()
+                print(f"Generation {generation + 1}: Best fitness = {best_individual.fitness:.2f}")
 
     def show_generation_summary(self):
         """Print some debug information on the current state of the population"""
         best = self.get_best_individual()
-        print(f"Best individual: {best}")
+        unique, entropy = self.get_diversity()
+        print(f"Best individual: {best}, {unique} distinct chromosomes, gene entropy {entropy:.2f}")
+
+    def get_diversity(self):
+        """Return the number of distinct chromosomes of the population, and the
+        mean over the gene positions of the entropy (in bits) of their genes"""
+        unique = len({bytes(individual.chromosome) for individual in self._population})
+        entropy = 0.0
+        for genes in zip(*(individual.chromosome for individual in self._population)):
+            for count in Counter(genes).values():
+                p = count / len(self._population)
+                entropy -= p * log2(p)
+        return unique, entropy / len(self._population[0].chromosome)
 
     def get_best_individual(self):
         """Return the best Individual of the population"""
         return max(self._population, key=lambda ind: ind.fitness)
 
-# Main code to solve the TSP problem
-city_dict = cities.load_cities("cities.txt")
-solver = GASolver(city_dict)
-solver.reset_population()
-solver.evolve_until(max_nb_of_generations=500)
-
-best = solver.get_best_individual()
-print(f"Best road: {best.chromosome}")
-print(f"Road length: {-best.fitness:.2f}")
+    def get_best_road(self):
+        """Return the road of the best Individual as a list of city names"""
+        return self._distances.decode_road(self.get_best_individual().chromosome)
 
-# Visualize the result
-cities.draw_cities(city_dict, best.chromosome)
+# Main code to solve the TSP problem
+if __name__ == '__main__':
+    city_dict = cities.load_cities("cities.txt")
+    solver = GASolver(city_dict)
+    solver.reset_population()
+    solver.evolve_until(max_nb_of_generations=500, log_every=50)
+
+    best = solver.get_best_individual()
+    best_road = solver.get_best_road()
+    print(f"Best road: {best_road}")
+    print(f"Road length: {-best.fitness:.2f}")
+
+    # Visualize the result
+    cities.draw_cities(city_dict, best_road)
@@ -0,0 +1 @@
+"""Lab part 2: the cities of the traveling salesperson problem (cities)"""
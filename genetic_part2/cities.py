@@ -10,10 +10,14 @@ This module is accompanied of a cities.txt file, containing a list of
 2D coordinates representing different cities.
 """
 
-import matplotlib.pyplot as plt
+import numpy as np
+from array import array
+from math import hypot, sqrt
 from random import shuffle
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 from collections.abc import Iterable, Mapping
+import os
+import struct
 
 Coordinates = Tuple[int, int]
 
@@ -28,6 +32,151 @@ def load_cities(filename) -> Dict[str,Coordinates]:
         return cities
 
 
+class CityArrays:
+    """Cities of a large TSP instance, as a name table and a contiguous
+    (n, 2) array of float coordinates instead of a dictionary of tuples.
+
+    Accepted wherever a dictionary of cities is (DistanceIndex,
+    SpatialIndex); positions are the indices of the arrays.
+    """
+
+    def __init__(self, names: List[str], coords: np.ndarray):
+        """Args:
+            names (list[str]): the city names
+            coords (numpy.ndarray): the (n, 2) array of their coordinates
+        """
+        self.names = names
+        self.coords = coords
+
+    def __len__(self):
+        """Number of cities"""
+        return len(self.names)
+
+    def to_dict(self) -> Dict[str, Tuple[float, float]]:
+        """The cities as a dictionary, in the format returned by load_cities"""
+        return dict(zip(self.names, map(tuple, self.coords.tolist())))
+
+
+_CACHE_MAGIC = b'CITIES1\n'
+_CACHE_HEADER = struct.Struct('<QQ')  # number of cities, size of the name table
+
+
+def _parse_cities(lines):
+    """Names and coordinates of the name;x;y lines of a cities file"""
+    nb_cities = int(lines[0])
+    names, flat = [], array('d')  # Floats parsed directly into a flat buffer
+    for line in lines[1:nb_cities + 1]:
+        name, x, y = line.rsplit(";", 2)
+        names.append(name)
+        flat.append(float(x))
+        flat.append(float(y))
+    return names, np.frombuffer(flat, dtype=np.float64).reshape(-1, 2)
+
+
+def _parse_tsplib(lines):
+    """Names and coordinates of the NODE_COORD_SECTION of a TSPLIB file.
+    Only EUC_2D files are accepted, DistanceIndex using the Euclidean
+    distance (not rounded to an integer as in TSPLIB)."""
+    header = {}
+    for start, line in enumerate(lines):
+        if line.strip().startswith("NODE_COORD_SECTION"):
+            break
+        key, _, value = line.partition(":")
+        header[key.strip().upper()] = value.strip()
+    else:
+        raise ValueError("TSPLIB file without NODE_COORD_SECTION")
+    if header.get("EDGE_WEIGHT_TYPE", "EUC_2D") != "EUC_2D":
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE {header['EDGE_WEIGHT_TYPE']}, "
+                         "only EUC_2D distances are computed")
+    names, flat = [], array('d')
+    for line in lines[start + 1:]:
+        fields = line.split()
+        if not fields or fields[0] == "EOF":
+            break
+        names.append(fields[0])
+        flat.append(float(fields[1]))
+        flat.append(float(fields[2]))
+    return names, np.frombuffer(flat, dtype=np.float64).reshape(-1, 2)
+
+
+def _write_cache(cache, cities: CityArrays):
+    """Write the cities to a binary cache file, atomically"""
+    names = "\n".join(cities.names).encode()
+    temporary = f"{cache}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(_CACHE_MAGIC)
+        file.write(_CACHE_HEADER.pack(len(cities), len(names)))
+        file.write(np.ascontiguousarray(cities.coords, dtype='<f8').tobytes())
+        file.write(names)
+    os.replace(temporary, cache)
+
+
+def _read_cache(cache) -> CityArrays:
+    """Read a binary cache file, the coordinates being memory-mapped"""
+    with open(cache, 'rb') as file:
+        if file.read(len(_CACHE_MAGIC)) != _CACHE_MAGIC:
+            raise ValueError(f"{cache} is not a cities cache")
+        nb_cities, names_size = _CACHE_HEADER.unpack(file.read(_CACHE_HEADER.size))
+        offset = len(_CACHE_MAGIC) + _CACHE_HEADER.size
+        file.seek(offset + 16 * nb_cities)
+        names = file.read(names_size).decode().split("\n") if nb_cities else []
+    coords = np.memmap(cache, dtype='<f8', mode='r', offset=offset, shape=(nb_cities, 2))
+    return CityArrays(names, coords)
+
+
+def load_city_arrays(filename, cache=None) -> CityArrays:
+    """ load a large cities list, as arrays, from a text file
+
+    The file is either in the cities.txt format (number of cities, then
+    name;x;y lines, integer or float coordinates) or a TSPLIB file with a
+    NODE_COORD_SECTION and EUC_2D distances (recognized by its .tsp
+    extension or header).
+
+    Args:
+        filename (str): the cities file
+        cache (str, optional): a binary cache file. If it is newer than the
+        cities file it is read instead (its coordinates memory-mapped),
+        otherwise it is written after parsing. Defaults to None.
+    """
+    if cache is not None and os.path.exists(cache) \
+            and os.path.getmtime(cache) >= os.path.getmtime(filename):
+        return _read_cache(cache)
+    with open(filename) as file:
+        lines = file.read().splitlines()
+    first = lines[0].strip() if lines else ""
+    if filename.lower().endswith(".tsp") or ":" in first or first.startswith("NAME"):
+        names, coords = _parse_tsplib(lines)
+    else:
+        names, coords = _parse_cities(lines)
+    cities = CityArrays(names, coords)
+    if cache is not None:
+        _write_cache(cache, cities)
+    return cities
+
+
+def _names_and_coords(cities: Union[Dict[str, Coordinates], CityArrays]):
+    """City names and coordinates of either a dictionary of cities (as a list
+    of pairs) or a CityArrays (its (n, 2) array itself, not copied)"""
+    if isinstance(cities, CityArrays):
+        return list(cities.names), np.asarray(cities.coords, dtype=np.float64)
+    return list(cities.keys()), list(cities.values())
+
+
+def _flat_coordinates(points: np.ndarray) -> memoryview:
+    """x0, y0, x1, y1... view of an (n, 2) array of coordinates, whose items
+    are read as Python floats (faster than indexing the array) and which
+    does not copy a memory-mapped array"""
+    return memoryview(np.ascontiguousarray(points).reshape(-1))
+
+
+def save_cities(cities: Dict[str, Coordinates], filename):
+    """ save a cities list to a text file, in the format read by load_cities """
+    with open(filename, 'w') as file:
+        file.write(f"{len(cities)}\n")
+        for city_name, (x, y) in cities.items():
+            file.write(f"{city_name};{x};{y}\n")
+
+
 def default_road(cities:Dict) -> List:
     """ Default road: all the cities in the order of the text file """
     return list(cities.keys())
@@ -35,6 +184,7 @@ def default_road(cities:Dict) -> List:
 
 def draw_cities(cities:Dict, road=Optional[Iterable[str]]):
     """ Plot the cities and the trajectory """
+    import matplotlib.pyplot as plt  # Only loaded to plot: slow to import
     x_cords, y_coords = tuple(zip(*cities.values()))
     plt.figure()
     plt.scatter(x_cords, y_coords, color="red")
@@ -67,6 +217,301 @@ def road_length(cities:Dict[str, Coordinates], road:Iterable[str]) -> float:
     return total
 
 
+class DistanceIndex:
+    """Pairwise distances between the cities of a TSP instance, computed once.
+
+    Cities are identified by their position in the dictionary given to the
+    constructor, and roads are sequences of those integer positions (see
+    encode_road and decode_road). Small instances keep a dense n*n matrix of
+    doubles; larger ones keep only the upper triangle as 32-bit floats, which
+    uses 8 times less memory. Beyond matrix_limit cities no matrix would fit
+    in memory, so distances are computed from the coordinates when needed.
+    """
+
+    def __init__(self, cities: Union[Dict[str, Coordinates], CityArrays],
+                 dense_limit=2000, matrix_limit=10000):
+        """Builds the distance index of a set of cities
+
+        Args:
+            cities (dict or CityArrays): the cities and their coordinates, as
+            returned by load_cities or load_city_arrays
+            dense_limit (int, optional): largest number of cities stored as
+            a dense matrix. Defaults to 2000.
+            matrix_limit (int, optional): largest number of cities whose
+            distances are stored at all. Defaults to 10000.
+        """
+        self.names, coords = _names_and_coords(cities)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        n = len(coords)
+        self._size = n
+        self.dense = n <= dense_limit
+        points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        x, y = points[:, 0], points[:, 1]
+        if self.dense:
+            self._matrix = array('d')
+            self._matrix.frombytes(np.hypot(x[:, None] - x, y[:, None] - y).tobytes())
+        elif n <= matrix_limit:
+            self._matrix = array('f')
+            for i in range(n - 1):
+                self._matrix.frombytes(
+                    np.hypot(x[i + 1:] - x[i], y[i + 1:] - y[i]).astype(np.float32).tobytes())
+        else:
+            self._matrix = None
+        # numpy view of the stored distances, for the batch road lengths
+        self._matrix_array = None if self._matrix is None \
+            else np.frombuffer(self._matrix, dtype=self._matrix.typecode)
+        self._points = points
+        self._xy = _flat_coordinates(points)
+
+    def __len__(self):
+        """Number of cities in the index"""
+        return self._size
+
+    def __getstate__(self):
+        """Pickled (e.g. for worker processes) without the memoryview"""
+        state = self.__dict__.copy()
+        del state['_xy']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._xy = _flat_coordinates(self._points)
+
+    def encode_road(self, road: Iterable[str]) -> List[int]:
+        """Convert a road of city names to a road of city positions"""
+        return [self.positions[c] for c in road]
+
+    def decode_road(self, road: Iterable[int]) -> List[str]:
+        """Convert a road of city positions to a road of city names"""
+        return [self.names[i] for i in road]
+
+    def between(self, i: int, j: int) -> float:
+        """Distance between the cities at positions i and j"""
+        if self.dense:
+            return self._matrix[i * self._size + j]
+        if i == j:
+            return 0.0
+        if self._matrix is None:
+            xy = self._xy
+            return hypot(xy[2 * i] - xy[2 * j], xy[2 * i + 1] - xy[2 * j + 1])
+        if i > j:
+            i, j = j, i
+        return self._matrix[i * (2 * self._size - i - 1) // 2 + j - i - 1]
+
+    def road_length(self, road: List[int]) -> float:
+        """Calculate the length of a closed road of city positions"""
+        if self.dense:
+            n, matrix = self._size, self._matrix
+            return sum(matrix[a * n + b] for a, b in zip(road, road[1:])) \
+                + matrix[road[-1] * n + road[0]]
+        between = self.between
+        return sum(between(a, b) for a, b in zip(road, road[1:])) \
+            + between(road[-1], road[0])
+
+    def road_lengths(self, roads) -> np.ndarray:
+        """Lengths of the closed roads of a 2-D array, one road per row,
+        gathered from the distances with array operations"""
+        starts = np.asarray(roads, dtype=np.intp)
+        ends = np.roll(starts, -1, axis=1)
+        n = self._size
+        if self.dense:
+            return self._matrix_array[starts * n + ends].sum(axis=1)
+        if self._matrix_array is None:
+            steps = self._points[starts] - self._points[ends]
+            return np.hypot(steps[..., 0], steps[..., 1]).sum(axis=1)
+        i, j = np.minimum(starts, ends), np.maximum(starts, ends)
+        distances = self._matrix_array[i * (2 * n - i - 1) // 2 + j - i - 1].astype(np.float64)
+        distances[i == j] = 0.0
+        return distances.sum(axis=1)
+
+    def swap_delta(self, road: List[int], i: int, j: int) -> float:
+        """Change of length of the road if the cities at indices i and j of
+        the road are swapped, computed from the (at most 4) affected edges
+        """
+        n = len(road)
+        if i == j or n <= 3:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        d = self.between
+        a, b = road[i], road[j]
+        prev_i, next_i = road[i - 1], road[i + 1]
+        prev_j, next_j = road[j - 1], road[(j + 1) % n]
+        if j == i + 1:  # ... prev_i a b next_j ...
+            return d(prev_i, b) + d(a, next_j) - d(prev_i, a) - d(b, next_j)
+        if i == 0 and j == n - 1:  # ... prev_j b | a next_i ...
+            return d(prev_j, a) + d(b, next_i) - d(prev_j, b) - d(a, next_i)
+        return (d(prev_i, b) + d(b, next_i) + d(prev_j, a) + d(a, next_j)
+                - d(prev_i, a) - d(a, next_i) - d(prev_j, b) - d(b, next_j))
+
+    def two_opt_delta(self, road: List[int], i: int, j: int) -> float:
+        """Change of length of the road if the segment road[i:j+1] is
+        reversed (2-opt move), computed from the 2 affected edges
+        """
+        n = len(road)
+        if i > j:
+            i, j = j, i
+        if i == j or (i == 0 and j == n - 1):
+            return 0.0
+        d = self.between
+        before, first = road[i - 1], road[i]
+        last, after = road[j], road[(j + 1) % n]
+        return d(before, last) + d(first, after) - d(before, first) - d(last, after)
+
+
+class SpatialIndex:
+    """Uniform grid over the cities of a TSP instance, answering nearest
+    neighbour and radius queries without measuring every pair of cities.
+
+    Cities are identified by their position in the dictionary, as in
+    DistanceIndex. The cells are sized to hold about 2 cities each, so a
+    query only looks at the few cells around a point: building the index is
+    O(n) and a k-nearest query costs about O(k) on evenly spread cities.
+    """
+
+    def __init__(self, cities: Union[Dict[str, Coordinates], CityArrays]):
+        """Builds the grid of a set of cities
+
+        Args:
+            cities (dict or CityArrays): the cities and their coordinates, as
+            returned by load_cities or load_city_arrays
+        """
+        self.coords = _names_and_coords(cities)[1]
+        n = len(self.coords)
+        points = np.asarray(self.coords, dtype=np.float64).reshape(-1, 2)
+        self._x0, self._y0 = points.min(axis=0).tolist() if n else (0, 0)
+        width, height = (points.max(axis=0) - (self._x0, self._y0)).tolist() if n else (0, 0)
+        # About 2 cities per cell, even if the cities are all on a line
+        self.cell_size = max(sqrt(2 * width * height / max(n, 1)), max(width, height) / max(n, 1), 1e-9)
+        self._columns = int(width / self.cell_size) + 1
+        self._rows = int(height / self.cell_size) + 1
+        self._cells = {}
+        columns = ((points[:, 0] - self._x0) / self.cell_size).astype(int).tolist()
+        rows = ((points[:, 1] - self._y0) / self.cell_size).astype(int).tolist()
+        for i, cell in enumerate(zip(columns, rows)):
+            self._cells.setdefault(cell, []).append(i)
+        self._xy = _flat_coordinates(points)
+
+    def __len__(self):
+        """Number of cities in the index"""
+        return len(self.coords)
+
+    def __getstate__(self):
+        """Pickled (e.g. for worker processes) without the memoryview"""
+        state = self.__dict__.copy()
+        del state['_xy']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._xy = _flat_coordinates(np.asarray(self.coords, dtype=np.float64).reshape(-1, 2))
+
+    def _point(self, city) -> Tuple[float, float]:
+        """Coordinates of the city at a position"""
+        return self._xy[2 * city], self._xy[2 * city + 1]
+
+    def _cell(self, x, y) -> Tuple[int, int]:
+        """Column and row of the cell containing a point"""
+        return int((x - self._x0) / self.cell_size), int((y - self._y0) / self.cell_size)
+
+    def _ring(self, column, row, radius):
+        """Cities of the cells of the grid at exactly radius cells from a
+        cell (which may be outside the grid)"""
+        cells = self._cells
+        if radius == 0:
+            yield from cells.get((column, row), ())
+            return
+        columns = range(max(column - radius, 0), min(column + radius, self._columns - 1) + 1)
+        for r in (row - radius, row + radius):
+            if 0 <= r < self._rows:
+                for c in columns:
+                    yield from cells.get((c, r), ())
+        rows = range(max(row - radius + 1, 0), min(row + radius - 1, self._rows - 1) + 1)
+        for c in (column - radius, column + radius):
+            if 0 <= c < self._columns:
+                for r in rows:
+                    yield from cells.get((c, r), ())
+
+    def nearest(self, point: Coordinates, k=1, skip=None) -> List[int]:
+        """Positions of the k cities nearest to a point, nearest first
+
+        Args:
+            point (tuple): the coordinates of the point
+            k (int, optional): number of cities returned. Defaults to 1.
+            skip (optional): a city position, or a container of positions,
+            not to return (e.g. the city at the point itself)
+        """
+        if isinstance(skip, int):
+            skip = (skip,)
+        skip = skip or ()
+        x, y = point
+        column, row = self._cell(x, y)
+        # Rings from the first one reaching the grid (the point may be out of
+        # it) to the one containing its farthest corner
+        first = max(-column, column - self._columns + 1, -row, row - self._rows + 1, 0)
+        largest = max(column, self._columns - 1 - column, row, self._rows - 1 - row)
+        found = []  # (distance, city) of the candidates, sorted
+        xy = self._xy
+        for radius in range(first, largest + 1):
+            for city in self._ring(column, row, radius):
+                if city not in skip:
+                    found.append((hypot(x - xy[2 * city], y - xy[2 * city + 1]), city))
+            # Cities beyond this ring are at least radius cells away
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                if found[-1][0] <= radius * self.cell_size:
+                    break
+        found.sort()
+        return [city for _, city in found[:k]]
+
+    def within(self, point: Coordinates, radius: float) -> List[int]:
+        """Positions of the cities at most radius away from a point"""
+        x, y = point
+        first_column, first_row = self._cell(x - radius, y - radius)
+        last_column, last_row = self._cell(x + radius, y + radius)
+        result, xy = [], self._xy
+        for column in range(max(first_column, 0), min(last_column, self._columns - 1) + 1):
+            for row in range(max(first_row, 0), min(last_row, self._rows - 1) + 1):
+                for city in self._cells.get((column, row), ()):
+                    if hypot(x - xy[2 * city], y - xy[2 * city + 1]) <= radius:
+                        result.append(city)
+        return result
+
+    def neighbour_lists(self, k: int) -> List[List[int]]:
+        """List, for each city, of its k nearest other cities, nearest first"""
+        return [self.nearest(self._point(i), k, skip=i) for i in range(len(self.coords))]
+
+    def nearest_neighbour_road(self, start=0) -> List[int]:
+        """Greedy road going from each city to the nearest city not visited yet
+
+        Visited cities are removed from a copy of the grid, so each step
+        only searches the cells around the current city while some
+        unvisited cities remain nearby.
+
+        Args:
+            start (int, optional): position of the first city. Defaults to 0.
+        """
+        n = len(self.coords)
+        if n == 0:
+            return []
+        cells = {cell: list(members) for cell, members in self._cells.items()}
+        grid, self._cells = self._cells, cells  # Queries only see unvisited cities
+        try:
+            road = [start]
+            cells[self._cell(*self._point(start))].remove(start)
+            for _ in range(n - 1):
+                city = self.nearest(self._point(road[-1]))[0]
+                members = cells[self._cell(*self._point(city))]
+                members.remove(city)
+                if not members:
+                    del cells[self._cell(*self._point(city))]
+                road.append(city)
+        finally:
+            self._cells = grid
+        return road
+
+
 if __name__ == '__main__':
     city_dict = load_cities("cities.txt")
     print(city_dict)
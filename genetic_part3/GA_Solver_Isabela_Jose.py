@@ -1,14 +1,30 @@
 from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+import contextlib
+import copy
+import functools
+import heapq
 import random
+import time
+
+import numpy as np
+
+from . import checkpoint
+from .fitness_cache import FitnessCache
+from .generation_stats import GenerationStats, gene_entropy, print_stats
+from .selection import SELECTIONS
 
 class Individual:
     """Represents an Individual for a genetic algorithm"""
 
+    __slots__ = ('chromosome', 'fitness')
+
     def __init__(self, chromosome: list, fitness: float):
         """Initializes an Individual for a genetic algorithm
 
         Args:
-            chromosome (list): a list representing the individual's chromosome
+            chromosome (sequence): the individual's chromosome, as defined by the GAProblem
             fitness (float): the individual's fitness (the higher, the better)
         """
         self.chromosome = chromosome
@@ -25,6 +41,44 @@ class Individual:
 class GAProblem(ABC):
     """Abstract base class defining the interface for a genetic algorithm problem."""
 
+    # Random generator of the problem's operators: the random module, until
+    # seed gives the problem a generator of its own
+    rng = random
+    _np_rng = None  # numpy generator of the batch operators, None until used
+
+    def seed(self, seed=None):
+        """Give the problem its own random generator (self.rng), seeded with
+        seed, so that its runs are reproducible without sharing the random
+        module's state. GASolver calls it when it is given a seed."""
+        self.rng = random.Random(seed)
+        self._np_rng = None
+
+    @property
+    def np_rng(self):
+        """numpy Generator of the batch operators, seeded from rng so that seed
+        and random.seed make them reproducible too: drawn once from the
+        problem's own generator, or at every use from the random module
+        (whose state random.seed may reset between runs)"""
+        if self.rng is random:
+            return np.random.default_rng(random.getrandbits(128))
+        if self._np_rng is None:
+            self._np_rng = np.random.default_rng(self.rng.getrandbits(128))
+        return self._np_rng
+
+    def rng_state(self):
+        """JSON-compatible state of all the problem's random generators, saved
+        in the solver's checkpoints. Problems with other generators than rng
+        and np_rng override it and set_rng_state."""
+        return {'random': _random_state(self.rng),
+                'numpy': None if self._np_rng is None else self._np_rng.bit_generator.state}
+
+    def set_rng_state(self, state):
+        """Restore a state returned by rng_state"""
+        _set_random_state(self.rng, state['random'])
+        self._np_rng = None
+        if state.get('numpy') is not None:
+            self.np_rng.bit_generator.state = state['numpy']
+
     @abstractmethod
     def generate_random_chromosome(self):
         """Generate a random chromosome for the problem."""
@@ -45,75 +99,766 @@ class GAProblem(ABC):
         """Apply mutation to a given chromosome."""
         pass
 
+    # Names of the mutation operators mutate_with_move can apply, for the
+    # operator choice of adaptive control (see the adaptive module)
+    mutation_operators = ()
+
+    def mutate_with_move(self, chromosome, operator=None):
+        """Apply mutation to a chromosome, also describing the change as a move
+        understood by fitness_delta.
+
+        Args:
+            chromosome: the chromosome to mutate
+            operator (str, optional): one of mutation_operators, None for the
+                default mutation. Defaults to None.
+
+        Returns:
+            tuple: (mutated chromosome, move). The default move, None, means
+            the fitness of the mutated chromosome has to be calculated.
+        """
+        return self.mutate(chromosome), None
+
+    def fitness_delta(self, chromosome, move):
+        """Change of fitness caused by a move of mutate_with_move, computed
+        from the few genes it changes instead of the whole chromosome.
+
+        Args:
+            chromosome: the chromosome before the move
+            move: the move returned by mutate_with_move
+
+        Returns:
+            float: the change of fitness, or None if it has to be calculated
+        """
+        return None
+
+    def fingerprint(self, chromosome):
+        """Return a hashable key identifying a chromosome, used to cache its
+        fitness. Defaults to the tuple of its genes."""
+        return tuple(chromosome)
+
+    def local_search(self, chromosome):
+        """Return an improved version of a chromosome, for the memetic stage of
+        the solver (see GASolver memetic_rate). Defaults to no improvement."""
+        return chromosome
+
+    def local_search_with_move(self, chromosome):
+        """Apply local_search to a chromosome, also describing the change as a
+        move understood by fitness_delta (see mutate_with_move).
+
+        Returns:
+            tuple: (improved chromosome, move). The default move, None, means
+            the fitness of the improved chromosome has to be calculated.
+        """
+        return self.local_search(chromosome), None
+
+    async def calculate_fitness_async(self, chromosome):
+        """Coroutine calculating the fitness of a chromosome, used by
+        async_solver.AsyncGASolver. Override it for fitness functions waiting
+        on IO (e.g. a remote service). Defaults to running calculate_fitness
+        in a thread."""
+        import asyncio  # Only needed by asynchronous solvers
+        return await asyncio.to_thread(self.calculate_fitness, chromosome)
+
+    # Optional batch hooks, used by the vectorized population engine.
+    # The defaults fall back to the per-chromosome methods above, so a
+    # problem only needs to override the ones it can express with arrays.
+
+    def calculate_fitness_batch(self, chromosomes):
+        """Calculate the fitness of every row of a 2-D array of chromosomes.
+
+        Args:
+            chromosomes (numpy.ndarray): one chromosome per row
+
+        Returns:
+            sequence of float: one fitness value per chromosome
+        """
+        return [self.calculate_fitness(chromosome) for chromosome in chromosomes]
+
+    def crossover_batch(self, parents1, parents2):
+        """Perform crossover between matching rows of two parent arrays.
+
+        Args:
+            parents1 (numpy.ndarray): first parent of each child, one per row
+            parents2 (numpy.ndarray): second parent of each child, one per row
+
+        Returns:
+            2-D sequence: one child chromosome per row
+        """
+        return [self.crossover(a, b) for a, b in zip(parents1, parents2)]
+
+    def mutate_batch(self, chromosomes):
+        """Apply mutation to every row of a 2-D array of chromosomes.
+
+        Args:
+            chromosomes (numpy.ndarray): one chromosome per row
+
+        Returns:
+            2-D sequence: one mutated chromosome per row
+        """
+        return [self.mutate(chromosome) for chromosome in chromosomes]
+
+# Problem of the current worker process, sent once when the pool starts
+_worker_problem = None
+
+
+def _init_worker(problem):
+    """Process pool initializer: keep the problem for all the following tasks"""
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _evaluate_chunk(chromosomes):
+    """Process pool task: calculate the fitness of a chunk of chromosomes"""
+    return [_worker_problem.calculate_fitness(chromosome) for chromosome in chromosomes]
+
+
+def _random_state(rng):
+    """JSON-compatible state of a random.Random generator (or of the random module)"""
+    version, internal_state, gauss_next = rng.getstate()
+    return [version, list(internal_state), gauss_next]
+
+
+def _set_random_state(rng, state):
+    """Restore a state returned by _random_state"""
+    version, internal_state, gauss_next = state
+    rng.setstate((version, tuple(internal_state), gauss_next))
+
+
+def _int_seed(sequence):
+    """128-bit integer seed drawn from a numpy SeedSequence"""
+    return int.from_bytes(sequence.generate_state(4).tobytes(), 'little')
+
+
+def timed(phase):
+    """Decorator of solver methods, adding their duration to a phase of the
+    solver's instrumentation (see the instrumentation module)"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self._instrumentation is None:
+                return method(self, *args, **kwargs)
+            with self._instrumentation.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_NO_PHASE = contextlib.nullcontext()
+
+
 class GASolver:
-    def __init__(self, problem: GAProblem, selection_rate=0.5, mutation_rate=0.1):
+    def __init__(self, problem: GAProblem, selection_rate=0.5, mutation_rate=0.1,
+                 parallel=False, n_workers=None, chunk_size=16, cache_size=0,
+                 selection='truncation', memetic_rate=0.0, generational_gap=None,
+                 suppress_duplicates=False, instrumentation=None, adaptive=None,
+                 seed=None):
         """Initializes an instance of a GA solver for a given problem
 
         Args:
             problem (GAProblem): An instance of a GAProblem to solve
             selection_rate (float, optional): Selection rate between 0 and 1.0. Defaults to 0.5.
             mutation_rate (float, optional): Mutation rate between 0 and 1.0. Defaults to 0.1.
+            parallel (bool, optional): Calculate fitness values on a pool of worker
+                processes. The problem must be picklable, and is sent to the workers
+                once, when the pool starts. Defaults to False.
+            n_workers (int, optional): Number of worker processes. Defaults to the
+                number of processors.
+            chunk_size (int, optional): Number of chromosomes sent to a worker per task.
+                Defaults to 16.
+            cache_size (int, optional): Number of fitness values memoized, by
+                problem.fingerprint, with least recently used eviction. 0 disables
+                the cache. Defaults to 0.
+            selection (str or callable, optional): How the surviving fraction of the
+                population is chosen: 'truncation' (the best ones), 'tournament',
+                'roulette', 'sus' (stochastic universal sampling) or a function
+                select(population, n, rng) (see the selection module). The best
+                Individual always survives. Defaults to 'truncation'.
+            memetic_rate (float, optional): Probability for each child to be improved
+                by problem.local_search after mutation. Defaults to 0.0.
+            generational_gap (float, optional): Steady-state evolution: fraction of
+                the population bred at each generation, each child replacing in
+                place the worst Individual if it is better. None for generational
+                evolution, where the whole non-surviving fraction is replaced.
+                Defaults to None.
+            suppress_duplicates (bool, optional): Mutate again (a few times at most)
+                the children whose problem.fingerprint is already in the population,
+                instead of spending evaluations on clones. Defaults to False.
+            instrumentation (instrumentation.Instrumentation, optional): Record the
+                time spent in each phase of every generation, and the counters.
+                Defaults to None.
+            adaptive (adaptive.AdaptiveControl, optional): Adjust the mutation rate,
+                the selection rate and the mutation operator after every generation.
+                Defaults to None.
+            seed (int or numpy.random.SeedSequence, optional): Seed of the solver's
+                random generators, and of the problem's (see GAProblem.seed): runs
+                with the same seed give the same results. Defaults to a seed drawn
+                from the random module, so that random.seed still makes runs
+                reproducible (the problem then keeps its generator).
         """
         self.problem = problem
+        if seed is None:
+            sequence = np.random.SeedSequence(random.getrandbits(128))
+        else:
+            sequence = seed if isinstance(seed, np.random.SeedSequence) \
+                else np.random.SeedSequence(seed)
+        solver_sequence, problem_sequence = sequence.spawn(2)
+        # Python generator for the per-decision draws (selection), numpy one
+        # for the bulk draws of each generation step
+        self._random = random.Random(_int_seed(solver_sequence))
+        self._np_rng = np.random.default_rng(solver_sequence)
+        if seed is not None:
+            problem.seed(_int_seed(problem_sequence))
         self._selection_rate = selection_rate
         self._mutation_rate = mutation_rate
+        self._memetic_rate = memetic_rate
+        self._generational_gap = generational_gap
         self._population = []
+        self._heap = None  # Steady-state: min-heap of (fitness, index), None when unknown
+        self._spare = []  # Individuals outside the population, reused as children
+        self._suppress_duplicates = suppress_duplicates
+        self._fingerprints = None  # Steady-state: fingerprint -> number of Individuals
+        self._duplicates = 0
+        self._instrumentation = instrumentation
+        self._adaptive = adaptive
+        if adaptive is not None:
+            adaptive.attach(self)
+        self._best = None  # Best Individual of the population, None when unknown
+        self._generation = 0
+        self._evaluations = 0
+        self._delta_evaluations = 0
+        self._select = SELECTIONS[selection] if isinstance(selection, str) else selection
+        self._parallel = parallel
+        self._n_workers = n_workers
+        self._chunk_size = chunk_size
+        self._executor = None
+        self._cache = FitnessCache(cache_size) if cache_size > 0 else None
+
+    @property
+    def generation(self):
+        """Number of generations evolved since the population was reset"""
+        return self._generation
+
+    @property
+    def rng(self):
+        """The solver's random.Random generator"""
+        return self._random
+
+    @property
+    def population(self):
+        """The list of the Individuals of the population"""
+        return self._population
+
+    @property
+    def mutation_rate(self):
+        """Probability for each child to be mutated"""
+        return self._mutation_rate
+
+    @mutation_rate.setter
+    def mutation_rate(self, value):
+        self._mutation_rate = value
+
+    @property
+    def selection_rate(self):
+        """Fraction of the population surviving as parents"""
+        return self._selection_rate
+
+    @selection_rate.setter
+    def selection_rate(self, value):
+        self._selection_rate = value
+
+    @property
+    def evaluations(self):
+        """Number of fitness values calculated by the problem (not found in the cache)"""
+        return self._evaluations
+
+    @property
+    def delta_evaluations(self):
+        """Number of fitness values updated with problem.fitness_delta instead
+        of being calculated"""
+        return self._delta_evaluations
+
+    @property
+    def duplicates(self):
+        """Number of duplicate children mutated again (see suppress_duplicates)"""
+        return self._duplicates
+
+    @property
+    def instrumentation(self):
+        """The Instrumentation recording the run, None if not instrumented"""
+        return self._instrumentation
+
+    @property
+    def cache_hits(self):
+        """Number of fitness values found in the cache"""
+        return self._cache.hits if self._cache is not None else 0
+
+    @property
+    def cache_misses(self):
+        """Number of fitness values that had to be calculated by the cache"""
+        return self._cache.misses if self._cache is not None else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes, if any"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def reset_population(self, pop_size=50):
         """Initialize the population with pop_size random Individuals"""
-        self._population = []
-        for _ in range(pop_size):
-            chromosome = self.problem.generate_random_chromosome()
-            fitness = self.problem.calculate_fitness(chromosome)
-            new_individual = Individual(chromosome, fitness)
-            self._population.append(new_individual)
+        self._drive(self._reset_steps(pop_size))
 
     def evolve_for_one_generation(self):
         """Apply the process for one generation:
-        - Sort the population (Descending order)
-        - Selection: Keep top fraction of the population
+        - Selection: Keep a fraction of the population (see selection)
         - Reproduction: Recreate the same quantity by crossing surviving individuals
         - Mutation: Mutate individuals with probability mutation_rate
+        - Local search: Improve individuals with probability memetic_rate
+        With a generational_gap, only that fraction of children is bred, and
+        each replaces the worst Individual if it is better (steady-state).
         """
-        # Sort the population in descending order of fitness
-        self._population.sort(reverse=True)
+        self._drive(self._generation_steps())
 
-        # Selection: Keep top fraction
-        survivors = int(self._selection_rate * len(self._population))
-        parents = self._population[:survivors]
+    def _drive(self, steps):
+        """Run a generator of steps, calculating the fitness of each list of
+        chromosomes it yields and sending the results back to it"""
+        fitnesses = None
+        try:
+            while True:
+                fitnesses = self._evaluate(steps.send(fitnesses))
+        except StopIteration:
+            pass
+
+    # The steps of a generation are written once, as generators yielding the
+    # chromosomes to evaluate and receiving their fitness values, so that
+    # other solvers (e.g. async_solver) can drive them and evaluate differently.
 
-        # Reproduction: Create new children
+    def _reset_steps(self, pop_size):
+        """Steps of reset_population"""
+        chromosomes = [self.problem.generate_random_chromosome() for _ in range(pop_size)]
+        fitnesses = yield chromosomes
+        self._population = [Individual(c, f) for c, f in zip(chromosomes, fitnesses)]
+        self._best = None
+        self._heap = None
+        self._generation = 0
+
+    def _generation_steps(self):
+        """Steps of evolve_for_one_generation"""
+        if self._generational_gap is not None:
+            children = self._spare_children()
+            chromosomes = self._breed(self._select_parents()[2], len(children),
+                                      self._population_fingerprints())
+            fitnesses = yield chromosomes
+            for child, chromosome, fitness in zip(children, chromosomes, fitnesses):
+                child.chromosome = chromosome
+                child.fitness = fitness
+            rescored, mutated = self._mutate(children)
+            for individual, fitness in zip(rescored, (yield mutated)):
+                individual.fitness = fitness
+            if self._memetic_rate > 0:
+                rescored, improved = self._improve(children)
+                for individual, fitness in zip(rescored, (yield improved)):
+                    individual.fitness = fitness
+            self._replace_in_place(children)
+            self._generation += 1
+            return
+
+        best, survivors, parents = self._select_parents()
+
+        # Reproduction: Create new children, then score them all at once
+        children = self._breed(parents, len(self._population) - survivors,
+                               self._parent_fingerprints(parents))
         new_population = parents.copy()
-        while len(new_population) < len(self._population):
-            a, b = random.sample(parents, 2)  # Select two random parents
-            child_chromosome = self.problem.crossover(a.chromosome, b.chromosome)
-            fitness = self.problem.calculate_fitness(child_chromosome)
-            new_individual = Individual(child_chromosome, fitness)
-            new_population.append(new_individual)
+        for child_chromosome, fitness in zip(children, (yield children)):
+            new_population.append(Individual(child_chromosome, fitness))
 
         # Mutation
-        for individual in new_population[survivors:]:  # Avoid mutating parents
-            if random.random() < self._mutation_rate:
-                mutated_chromosome = self.problem.mutate(individual.chromosome)
-                individual.chromosome = mutated_chromosome
-                individual.fitness = self.problem.calculate_fitness(mutated_chromosome)
+        rescored, mutated = self._mutate(new_population[survivors:])  # Avoid mutating parents
+        for individual, fitness in zip(rescored, (yield mutated)):
+            individual.fitness = fitness
+
+        # Local search (memetic stage)
+        if self._memetic_rate > 0:
+            rescored, improved = self._improve(new_population[survivors:])
+            for individual, fitness in zip(rescored, (yield improved)):
+                individual.fitness = fitness
 
+        self._end_generation(new_population, survivors, best)
+        self._generation += 1
+
+    @timed('selection')
+    def _select_parents(self):
+        """Selection: Keep a fraction, always including the best individual
+
+        Returns:
+            tuple: (best Individual, number of survivors, list of the survivors)
+        """
+        best = self.get_best_individual()
+        survivors = int(self._selection_rate * len(self._population))
+        parents = self._select(self._population, survivors, self._random)
+        if not any(parent is best for parent in parents):
+            parents[-1] = best
+        return best, survivors, parents
+
+    @timed('crossover')
+    def _breed(self, parents, nb_children, seen=None):
+        """Chromosomes of nb_children children of random pairs of parents
+
+        Args:
+            parents (list[Individual]): the Individuals to cross
+            nb_children (int): number of children
+            seen (container, optional): fingerprints already in the population.
+                A child whose fingerprint is in it, or is the one of another
+                child, is mutated again (3 times at most). Defaults to None.
+        """
+        children = []
+        new = set()
+        fingerprint = self.problem.fingerprint
+        # Two distinct random parents per child, drawn at once
+        first = self._np_rng.integers(0, len(parents), nb_children)
+        second = self._np_rng.integers(0, len(parents) - 1, nb_children)
+        second += second >= first
+        for i, j in zip(first.tolist(), second.tolist()):
+            child = self.problem.crossover(parents[i].chromosome, parents[j].chromosome)
+            if seen is not None:
+                key = fingerprint(child)
+                for _ in range(3):
+                    if key not in seen and key not in new:
+                        break
+                    self._duplicates += 1
+                    child = self.problem.mutate(child)
+                    key = fingerprint(child)
+                new.add(key)
+            children.append(child)
+        self._count_chromosomes(len(children))
+        return children
+
+    def _parent_fingerprints(self, parents):
+        """Fingerprints of the parents, if duplicates are suppressed"""
+        if not self._suppress_duplicates:
+            return None
+        fingerprint = self.problem.fingerprint
+        return {fingerprint(parent.chromosome) for parent in parents}
+
+    def _population_fingerprints(self):
+        """Number of Individuals of the steady-state population having each
+        fingerprint (kept up to date by _replace_in_place), if duplicates are
+        suppressed"""
+        if not self._suppress_duplicates:
+            return None
+        if self._fingerprints is None or self._heap is None:
+            self._fingerprints = Counter(self.problem.fingerprint(individual.chromosome)
+                                         for individual in self._population)
+        return self._fingerprints
+
+    @timed('mutation')
+    def _mutate(self, individuals):
+        """Mutate Individuals with probability mutation_rate, updating their
+        fitness with problem.fitness_delta when it is known
+
+        Returns:
+            tuple: (mutated Individuals whose fitness must be calculated,
+            their chromosomes)
+        """
+        rescored, mutated = [], []
+        delta_evaluations = self._delta_evaluations
+        draws = self._np_rng.random(len(individuals)).tolist()
+        for individual, draw in zip(individuals, draws):
+            if draw >= self._mutation_rate:
+                continue
+            if self._adaptive is None:
+                mutated_chromosome, move = self.problem.mutate_with_move(individual.chromosome)
+            else:
+                operator = self._adaptive.choose_operator()
+                mutated_chromosome, move = self.problem.mutate_with_move(individual.chromosome, operator)
+                self._adaptive.record(operator, individual.fitness, individual)
+            delta = None if move is None else self.problem.fitness_delta(individual.chromosome, move)
+            individual.chromosome = mutated_chromosome
+            if delta is None:
+                rescored.append(individual)
+                mutated.append(mutated_chromosome)
+            else:  # Incremental update, no need to score the whole chromosome
+                individual.fitness += delta
+                self._delta_evaluations += 1
+        self._count_chromosomes(len(rescored) + self._delta_evaluations - delta_evaluations)
+        return rescored, mutated
+
+    @timed('local_search')
+    def _improve(self, individuals):
+        """Improve Individuals with probability memetic_rate by problem.local_search,
+        updating their fitness with problem.fitness_delta when it is known
+
+        Returns:
+            tuple: (improved Individuals whose fitness must be calculated,
+            their chromosomes)
+        """
+        if self._adaptive is not None:
+            self._adaptive.credit()  # Before local search changes the mutants
+        rescored, improved = [], []
+        delta_evaluations = self._delta_evaluations
+        draws = self._np_rng.random(len(individuals)).tolist()
+        for individual, draw in zip(individuals, draws):
+            if draw >= self._memetic_rate:
+                continue
+            improved_chromosome, move = self.problem.local_search_with_move(individual.chromosome)
+            delta = None if move is None else self.problem.fitness_delta(individual.chromosome, move)
+            individual.chromosome = improved_chromosome
+            if delta is None:
+                rescored.append(individual)
+                improved.append(improved_chromosome)
+            else:  # The search measured its own change of fitness
+                individual.fitness += delta
+                self._delta_evaluations += 1
+        self._count_chromosomes(len(rescored) + self._delta_evaluations - delta_evaluations)
+        return rescored, improved
+
+    def _count_chromosomes(self, n):
+        """Count n new chromosomes in the instrumentation, if any"""
+        if self._instrumentation is not None:
+            self._instrumentation.chromosomes += n
+
+    def _phase(self, phase):
+        """Context manager timing a phase in the instrumentation, if any"""
+        if self._instrumentation is None:
+            return _NO_PHASE
+        return self._instrumentation.phase(phase)
+
+    @timed('replacement')
+    def _end_generation(self, new_population, survivors, best):
+        """Replace the population, keeping track of its best Individual"""
+        # Parents are not mutated, so only the children can beat the best one
+        self._best = max(new_population[survivors:], key=lambda ind: ind.fitness, default=best)
+        if self._best.fitness < best.fitness:
+            self._best = best
         self._population = new_population
+        self._heap = None
 
-    def evolve_until(self, max_nb_of_generations=500, threshold_fitness=None):
-        """Evolve the population until a condition is met:
-        - Max number of generations is reached, or
-        - A sufficiently high fitness value is achieved
+    def _spare_children(self):
+        """Individuals to breed at a steady-state generation, reusing the ones
+        that left the population (or did not enter it) in previous generations"""
+        nb_children = max(1, round(self._generational_gap * len(self._population)))
+        while len(self._spare) < nb_children:
+            self._spare.append(Individual(None, 0.0))
+        del self._spare[nb_children:]
+        return self._spare
+
+    @timed('replacement')
+    def _replace_in_place(self, children):
+        """Put each child in place of the worst Individual, if it is better,
+        the replaced Individual becoming a spare one"""
+        population = self._population
+        if self._heap is None:
+            self._heap = [(individual.fitness, i) for i, individual in enumerate(population)]
+            heapq.heapify(self._heap)
+        heap = self._heap
+        for k, child in enumerate(children):
+            fitness, i = heap[0]  # The worst Individual
+            if child.fitness <= fitness:
+                continue
+            if self._fingerprints is not None:
+                fingerprints = self._fingerprints
+                key = self.problem.fingerprint(population[i].chromosome)
+                fingerprints[key] -= 1
+                if not fingerprints[key]:
+                    del fingerprints[key]  # So that "in" only finds the population
+                fingerprints[self.problem.fingerprint(child.chromosome)] += 1
+            self._spare[k], population[i] = population[i], child
+            heapq.heapreplace(heap, (child.fitness, i))
+            if self._best is not None and child.fitness > self._best.fitness:
+                self._best = child
+
+    def run(self, max_nb_of_generations=500, track_diversity=False):
+        """Evolve the population one generation at a time, yielding the stats
+        of each generation. Stop iterating to stop the evolution.
+
+        Args:
+            max_nb_of_generations (int, optional): Defaults to 500.
+            track_diversity (bool, optional): Measure the number and fraction of
+                distinct chromosomes and the mean gene entropy (costs one fingerprint
+                per Individual and one pass over the genes). Defaults to False.
+
+        Yields:
+            GenerationStats: the stats of the population after each generation
         """
-        for generation in range(max_nb_of_generations):
+        for _ in range(max_nb_of_generations):
+            start = self._start_generation()
             self.evolve_for_one_generation()
-            best_individual = self.get_best_individual()
-            print(f"Generation {generation + 1}: Best fitness = {best_individual.fitness:.2f}")
+            yield self._finish_generation(start, track_diversity)
+
+    def _start_generation(self):
+        """Bookkeeping before evolving a generation in run: return its start time"""
+        if self._instrumentation is not None:
+            self._instrumentation.start_generation(self)
+        return time.perf_counter()
+
+    def _finish_generation(self, start, track_diversity):
+        """Bookkeeping after evolving a generation in run: return its stats"""
+        if self._instrumentation is not None:
+            self._instrumentation.end_generation(self)
+        stats = self._generation_stats(time.perf_counter() - start, track_diversity)
+        if self._adaptive is not None:
+            self._adaptive.end_generation(self, stats)
+        return stats
 
-            if threshold_fitness is not None and best_individual.fitness >= threshold_fitness:
+    def evolve_until(self, max_nb_of_generations=500, threshold_fitness=None,
+                     callbacks=(), stop_when=(), log_every=0, track_diversity=False):
+        """Evolve the population until a condition is met:
+        - Max number of generations is reached, or
+        - A sufficiently high fitness value is achieved, or
+        - An early-stopping predicate returns True
+
+        Args:
+            max_nb_of_generations (int, optional): Defaults to 500.
+            threshold_fitness (float, optional): Defaults to None.
+            callbacks (iterable, optional): functions called as callback(solver, stats)
+                after each generation. Defaults to ().
+            stop_when (iterable, optional): predicates called as predicate(stats) after
+                each generation, stopping the evolution when one returns True. Defaults to ().
+            log_every (int, optional): Print the best fitness every log_every
+                generations, 0 to stay silent. Defaults to 0.
+            track_diversity (bool, optional): See run. Defaults to False.
+
+        Returns:
+            GenerationStats: the stats of the last generation, None if none was evolved
+        """
+        callbacks = list(callbacks)
+        stop_when = list(stop_when)
+        if log_every:
+            callbacks.append(print_stats(log_every))
+        stats = None
+        for stats in self.run(max_nb_of_generations, track_diversity):
+            if self._should_stop(stats, callbacks, threshold_fitness, stop_when):
                 break
+        return stats
+
+    def _should_stop(self, stats, callbacks, threshold_fitness, stop_when):
+        """Call the callbacks of evolve_until on the stats of a generation,
+        and tell whether one of its stopping conditions is met"""
+        for callback in callbacks:
+            callback(self, stats)
+        if threshold_fitness is not None and stats.best_fitness >= threshold_fitness:
+            return True
+        return any(predicate(stats) for predicate in stop_when)
 
     def get_best_individual(self):
         """Return the best Individual of the population"""
-        return max(self._population, key=lambda ind: ind.fitness)
+        if self._best is None:
+            self._best = max(self._population, key=lambda ind: ind.fitness)
+        return self._best
+
+    def _generation_stats(self, duration, track_diversity):
+        """Summarize the population"""
+        best = self.get_best_individual()
+        total = sum(individual.fitness for individual in self._population)
+        diversity = unique = entropy = None
+        if track_diversity:
+            fingerprint = self.problem.fingerprint
+            unique = len({fingerprint(individual.chromosome) for individual in self._population})
+            diversity = unique / len(self._population)
+            entropy = gene_entropy([individual.chromosome for individual in self._population])
+        return GenerationStats(self._generation, best, best.fitness,
+                               total / len(self._population), diversity, duration,
+                               unique, entropy)
+
+    def get_top_individuals(self, n):
+        """Return copies of the n best Individuals of the population"""
+        return [Individual(copy.copy(ind.chromosome), ind.fitness)
+                for ind in heapq.nlargest(n, self._population, key=lambda ind: ind.fitness)]
+
+    def replace_worst(self, individuals):
+        """Replace the worst Individuals of the population by the given ones
+        (e.g. migrants coming from another population)"""
+        worst = heapq.nsmallest(len(individuals), range(len(self._population)),
+                                key=lambda i: self._population[i].fitness)
+        for i, individual in zip(worst, individuals):
+            self._population[i] = individual
+        self._best = None
+        self._heap = None
+
+    def checkpoint(self):
+        """Return a snapshot of the run (population, generation counter,
+        random generator state and cache counters), see the checkpoint module"""
+        typecode, length, genes, fitness = self._snapshot()
+        return checkpoint.Checkpoint(self._generation, typecode, length, genes, fitness,
+                                     self._rng_state(), self.cache_hits, self.cache_misses)
+
+    def save_checkpoint(self, path):
+        """Atomically write a checkpoint of the run to a file. For periodic
+        checkpoints in the background, use a checkpoint.CheckpointWriter
+        callback in evolve_until."""
+        checkpoint.save(path, self.checkpoint())
+
+    def resume(self, path):
+        """Restore the run saved in a checkpoint file, to continue evolving it.
+        Chromosomes are restored as array.array objects."""
+        saved = checkpoint.load(path)
+        self._restore(saved.typecode, saved.chromosome_length, saved.genes, saved.fitness)
+        self._generation = saved.generation
+        self._set_rng_state(saved.rng_state)
+        if self._cache is not None:
+            self._cache.hits = saved.cache_hits
+            self._cache.misses = saved.cache_misses
+
+    def _snapshot(self):
+        """Copy the population to flat arrays: (typecode, chromosome length,
+        genes, fitness)"""
+        first = self._population[0].chromosome
+        typecode = first.typecode if isinstance(first, array) else 'q'
+        length = len(first)
+        genes = array(typecode)
+        for individual in self._population:
+            if len(individual.chromosome) != length:
+                raise ValueError("Only fixed-length chromosomes can be checkpointed")
+            genes.extend(individual.chromosome)
+        fitness = array('d', (individual.fitness for individual in self._population))
+        return typecode, length, genes, fitness
+
+    def _restore(self, typecode, length, genes, fitness):
+        """Rebuild the population from the flat arrays of _snapshot"""
+        self._population = [Individual(genes[i * length:(i + 1) * length], f)
+                            for i, f in enumerate(fitness)]
+        self._best = None
+        self._heap = None
+
+    def _rng_state(self):
+        """JSON-compatible state of the random generators of the solver and
+        of the problem"""
+        return {'random': _random_state(self._random),
+                'numpy': self._np_rng.bit_generator.state,
+                'problem': self.problem.rng_state()}
+
+    def _set_rng_state(self, state):
+        """Restore a state returned by _rng_state"""
+        _set_random_state(self._random, state['random'])
+        self._np_rng.bit_generator.state = state['numpy']
+        self.problem.set_rng_state(state['problem'])
+
+    @timed('evaluation')
+    def _evaluate(self, chromosomes):
+        """Return the fitness of a list of chromosomes, from the cache if enabled"""
+        if self._cache is None:
+            return self._calculate(chromosomes)
+        keys = [self.problem.fingerprint(chromosome) for chromosome in chromosomes]
+        return self._cache.evaluate(chromosomes, keys, self._calculate)
+
+    def _calculate(self, chromosomes):
+        """Calculate the fitness of a list of chromosomes, on the worker
+        processes in chunks of chunk_size if the solver is parallel"""
+        self._evaluations += len(chromosomes)
+        if not self._parallel or not chromosomes:
+            return [self.problem.calculate_fitness(chromosome) for chromosome in chromosomes]
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor  # Only for parallel solvers
+            self._executor = ProcessPoolExecutor(max_workers=self._n_workers,
+                                                 initializer=_init_worker,
+                                                 initargs=(self.problem,))
+        chunks = [chromosomes[i:i + self._chunk_size]
+                  for i in range(0, len(chromosomes), self._chunk_size)]
+        return [fitness for chunk in self._executor.map(_evaluate_chunk, chunks)
+                for fitness in chunk]
 
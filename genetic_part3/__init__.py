@@ -0,0 +1,52 @@
+"""
+Generic genetic algorithm solver, with the Mastermind and TSP problems.
+
+Its public names are only imported on first access, so that importing the
+package (or a single module, e.g. in a worker process) does not load the
+whole solver with numpy and matplotlib:
+
+    import genetic_part3 as ga
+
+    problem = ga.TSProblem(ga.load_cities('cities.txt'))
+    solver = ga.GASolver(problem, seed=0)
+
+The modules import each other relatively, and the mastermind and cities
+modules from the genetic_part1 and genetic_part2 packages, so they run from
+the repository root: python -m genetic_part3 for the command line interface
+(see __main__), python -m genetic_part3.tsp_problem for a module's demo.
+"""
+import importlib
+
+# Public name: module defining it (relative to this package), imported on
+# first access
+_EXPORTS = {
+    'GAProblem': '.GA_Solver_Isabela_Jose',
+    'GASolver': '.GA_Solver_Isabela_Jose',
+    'Individual': '.GA_Solver_Isabela_Jose',
+    'AsyncGASolver': '.async_solver',
+    'BatchingAdapter': '.async_solver',
+    'VectorizedGASolver': '.vectorized_solver',
+    'IslandModel': '.island_model',
+    'MastermindProblem': '.mastermind_problem',
+    'TSProblem': '.tsp_problem',
+    'AdaptiveControl': '.adaptive',
+    'Instrumentation': '.instrumentation',
+    'GenerationStats': '.generation_stats',
+    'MastermindMatch': 'genetic_part1.mastermind',
+    'load_cities': 'genetic_part2.cities',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import the module defining a public name when it is first used"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # Later accesses do not go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,108 @@
+"""
+Command line interface of the generic GA solver:
+
+    python -m genetic_part3 mastermind --size 6 --seed 0
+    python -m genetic_part3 tsp --cities cities.txt --memetic-rate 0.1 --plot
+    python -m genetic_part3 sweep --problem tsp --size 100
+    python -m genetic_part3 benchmark --output results.json
+
+The solver modules are only imported by the command that needs them, and
+matplotlib only with tsp --plot.
+"""
+import argparse
+import importlib
+import os
+import random
+import sys
+
+# Commands handled by the main function of a module, which parses the rest
+# of the arguments
+TOOLS = {
+    'sweep': "hyperparameter sweep with successive halving (see sweep.py)",
+    'benchmark': "speed and memory benchmark (see benchmark.py)",
+}
+CITIES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      'genetic_part2', 'cities.txt')
+
+
+def solve_mastermind(args):
+    """Guess the secret of a random Mastermind match"""
+    from genetic_part1 import mastermind as mm
+    from .GA_Solver_Isabela_Jose import GASolver
+    from .mastermind_problem import MastermindProblem
+
+    match = mm.MastermindMatch(secret_size=args.size, rng=random.Random(args.seed))
+    solver = GASolver(MastermindProblem(match), args.selection_rate, args.mutation_rate,
+                      seed=args.seed)
+    solver.reset_population(args.pop_size)
+    solver.evolve_until(args.generations, threshold_fitness=match.max_score(),
+                        log_every=args.log_every)
+    best_guess = mm.decode_guess(solver.get_best_individual().chromosome)
+    print(f"Best guess: {best_guess}")
+    print(f"Problem solved? {match.is_correct(best_guess)}")
+
+
+def solve_tsp(args):
+    """Search a short road through the cities of a file"""
+    from genetic_part2 import cities
+    from .GA_Solver_Isabela_Jose import GASolver
+    from .tsp_problem import TSProblem
+
+    city_dict = cities.load_cities(args.cities)
+    problem = TSProblem(city_dict, crossover_operator=args.crossover,
+                        initial_roads=args.initial_roads)
+    solver = GASolver(problem, args.selection_rate, args.mutation_rate,
+                      memetic_rate=args.memetic_rate, seed=args.seed)
+    solver.reset_population(args.pop_size)
+    solver.evolve_until(args.generations, log_every=args.log_every)
+    best = solver.get_best_individual()
+    best_road = problem.decode(best.chromosome)
+    print(f"Best road: {best_road}")
+    print(f"Road length: {-best.fitness:.2f}")
+    if args.plot:
+        cities.draw_cities(city_dict, best_road)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in TOOLS:
+        return importlib.import_module(f'.{argv[0]}', __package__).main(argv[1:])
+
+    parser = argparse.ArgumentParser(prog='python -m genetic_part3',
+                                     description="Solve problems with the generic GA solver")
+    commands = parser.add_subparsers(dest='command', required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--pop-size', type=int, default=50)
+    common.add_argument('--generations', type=int, default=500)
+    common.add_argument('--selection-rate', type=float, default=0.5)
+    common.add_argument('--mutation-rate', type=float, default=0.1)
+    common.add_argument('--seed', type=int, default=None,
+                        help="seed of the run (and of the Mastermind secret)")
+    common.add_argument('--log-every', type=int, default=10, metavar='N',
+                        help="print the best fitness every N generations, 0 to stay silent")
+
+    mastermind = commands.add_parser('mastermind', parents=[common],
+                                     help="guess the secret of a random match")
+    mastermind.add_argument('--size', type=int, default=4, help="size of the secret")
+    mastermind.set_defaults(solve=solve_mastermind)
+
+    tsp = commands.add_parser('tsp', parents=[common],
+                              help="search a short road through cities")
+    tsp.add_argument('--cities', default=CITIES, help="file in the cities.txt format")
+    tsp.add_argument('--crossover', default='one_point',
+                     choices=['one_point', 'ox', 'pmx', 'cx', 'erx'])
+    tsp.add_argument('--initial-roads', default='random', choices=['random', 'nearest'])
+    tsp.add_argument('--memetic-rate', type=float, default=0.0,
+                     help="probability of improving a child by local search")
+    tsp.add_argument('--plot', action='store_true', help="draw the best road")
+    tsp.set_defaults(solve=solve_tsp)
+
+    for name, description in TOOLS.items():
+        commands.add_parser(name, help=description, add_help=False)
+
+    args = parser.parse_args(argv)
+    args.solve(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Adaptive control of the generic GA solver's parameters, instead of tuning
+them by hand for every problem instance (GASolver(..., adaptive=...)).
+
+- Operator choice: when the problem offers several mutation operators
+  (GAProblem.mutation_operators, e.g. swap, inversion and 2-opt for the
+  TSP), each mutation uses the operator chosen by a discounted UCB1 bandit,
+  rewarded when the mutant is better than the child it comes from. Older
+  rewards fade away, so the choice follows the needs of the search (e.g.
+  large moves first, small ones near convergence).
+- Mutation rate: raised when the population loses its diversity or the
+  best fitness stagnates, decayed back towards its initial value otherwise.
+- Selection pressure: the fraction of surviving parents shrinks (stronger
+  pressure) while the best fitness improves, and grows again when it
+  stagnates, to explore more.
+All the updates cost O(number of mutations + a small sample) per generation.
+"""
+from math import log, sqrt
+
+
+class OperatorBandit:
+    """Discounted UCB1 bandit choosing between named operators"""
+
+    def __init__(self, operators, discount=0.9, exploration=0.5):
+        """Initializes a bandit with no observation
+
+        Args:
+            operators (sequence[str]): the names of the operators
+            discount (float, optional): factor applied to past observations at
+            every generation. Defaults to 0.9.
+            exploration (float, optional): weight of the UCB exploration
+            term. Defaults to 0.5.
+        """
+        self.operators = list(operators)
+        self._discount = discount
+        self._exploration = exploration
+        self.counts = dict.fromkeys(self.operators, 0.0)  # Discounted numbers of uses
+        self.rewards = dict.fromkeys(self.operators, 0.0)  # Discounted sums of rewards
+
+    def choose(self) -> str:
+        """The operator with the highest upper confidence bound"""
+        total = sum(self.counts.values())
+        best, best_bound = None, -1.0
+        for operator in self.operators:
+            count = self.counts[operator]
+            if count < 1e-6:
+                return operator  # Try every operator at least once
+            bound = self.rewards[operator] / count \
+                + self._exploration * sqrt(log(max(total, 1.0)) / count)
+            if bound > best_bound:
+                best, best_bound = operator, bound
+        return best
+
+    def reward(self, operator, value):
+        """Record the reward (between 0 and 1) of a use of an operator"""
+        self.counts[operator] += 1.0
+        self.rewards[operator] += value
+
+    def discount(self):
+        """Fade the past observations away, once per generation"""
+        for operator in self.operators:
+            self.counts[operator] *= self._discount
+            self.rewards[operator] *= self._discount
+
+    def probabilities(self):
+        """Share of the (discounted) uses of each operator"""
+        total = sum(self.counts.values()) or 1.0
+        return {operator: count / total for operator, count in self.counts.items()}
+
+
+class AdaptiveControl:
+    """Online adjustment of a solver's mutation operator, mutation rate and
+    selection rate"""
+
+    def __init__(self, mutation_rate_range=(0.01, 0.9), selection_rate_range=(0.2, 0.8),
+                 target_diversity=0.5, patience=5, step=1.2, discount=0.9,
+                 exploration=0.5, diversity_sample=64):
+        """Initializes a controller, to give to a single GASolver
+
+        Args:
+            mutation_rate_range (tuple, optional): bounds of the mutation rate.
+            Defaults to (0.01, 0.9).
+            selection_rate_range (tuple, optional): bounds of the selection
+            rate. Defaults to (0.2, 0.8).
+            target_diversity (float, optional): fraction of distinct chromosomes
+            below which mutation is increased. Defaults to 0.5.
+            patience (int, optional): generations without improvement of the
+            best fitness after which the search is widened. Defaults to 5.
+            step (float, optional): factor applied to the rates at each
+            adjustment. Defaults to 1.2.
+            discount (float, optional): see OperatorBandit. Defaults to 0.9.
+            exploration (float, optional): see OperatorBandit. Defaults to 0.5.
+            diversity_sample (int, optional): number of Individuals sampled to
+            estimate the diversity when the solver does not track it.
+            Defaults to 64.
+        """
+        self._mutation_rate_range = mutation_rate_range
+        self._selection_rate_range = selection_rate_range
+        self._target_diversity = target_diversity
+        self._patience = patience
+        self._step = step
+        self._discount = discount
+        self._exploration = exploration
+        self._diversity_sample = diversity_sample
+        self.bandit = None  # Created for the problem's operators
+        self._initial_mutation_rate = None
+        self._best_fitness = None
+        self._stagnation = 0
+        self._trials = []  # (operator, fitness before mutation, Individual)
+        self.history = []  # (mutation rate, selection rate) after each generation
+
+    def attach(self, solver):
+        """Called by the solver: start from its rates and its problem's operators"""
+        self._initial_mutation_rate = solver.mutation_rate
+        operators = solver.problem.mutation_operators
+        self.bandit = OperatorBandit(operators, self._discount, self._exploration) \
+            if len(operators) > 1 else None
+
+    def choose_operator(self):
+        """The mutation operator to use, None for the problem's default one"""
+        return self.bandit.choose() if self.bandit is not None else None
+
+    def record(self, operator, fitness_before, individual):
+        """Remember a mutation, rewarded once the mutant's fitness is known"""
+        if self.bandit is not None:
+            self._trials.append((operator, fitness_before, individual))
+
+    def credit(self):
+        """Reward the operators of the recorded mutations that improved their
+        Individual (called before the mutants change again, e.g. by local search)"""
+        for operator, fitness_before, individual in self._trials:
+            self.bandit.reward(operator, 1.0 if individual.fitness > fitness_before else 0.0)
+        self._trials.clear()
+
+    def end_generation(self, solver, stats):
+        """Adjust the solver's rates after a generation"""
+        self.credit()
+        if self.bandit is not None:
+            self.bandit.discount()
+
+        improved = self._best_fitness is None or stats.best_fitness > self._best_fitness
+        if improved:
+            self._best_fitness = stats.best_fitness
+            self._stagnation = 0
+        else:
+            self._stagnation += 1
+        diversity = stats.diversity if stats.diversity is not None \
+            else self._estimate_diversity(solver)
+
+        low, high = self._mutation_rate_range
+        mutation_rate = solver.mutation_rate
+        if diversity < self._target_diversity or self._stagnation >= self._patience:
+            mutation_rate *= self._step
+        elif mutation_rate > self._initial_mutation_rate:
+            mutation_rate = max(mutation_rate / self._step, self._initial_mutation_rate)
+        solver.mutation_rate = min(max(mutation_rate, low), high)
+
+        low, high = self._selection_rate_range
+        selection_rate = solver.selection_rate
+        if improved:
+            selection_rate /= self._step  # Fewer parents: stronger pressure
+        elif self._stagnation >= self._patience:
+            selection_rate *= self._step
+        solver.selection_rate = min(max(selection_rate, low), high)
+        if self._stagnation >= self._patience:
+            self._stagnation = 0  # Widened, give it patience generations again
+        self.history.append((solver.mutation_rate, solver.selection_rate))
+
+    def _estimate_diversity(self, solver):
+        """Fraction of distinct chromosomes in a random sample of the population"""
+        population = solver.population
+        sample = solver.rng.sample(population, min(self._diversity_sample, len(population)))
+        fingerprint = solver.problem.fingerprint
+        return len({fingerprint(individual.chromosome) for individual in sample}) / len(sample)
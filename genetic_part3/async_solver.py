@@ -0,0 +1,192 @@
+"""
+Asynchronous variant of the generic GA solver, for fitness functions that
+wait on IO, e.g. calls to a remote simulator service.
+
+AsyncGASolver scores chromosomes with the coroutine
+problem.calculate_fitness_async (see GAProblem). All the chromosomes of a
+generation step are awaited concurrently, at most max_concurrency at a time,
+each with a timeout and a number of retries, instead of one round-trip after
+the other. A BatchingAdapter coalesces these concurrent single-chromosome
+requests into bulk calls, for services that accept batches:
+
+    class RemoteProblem(TSProblem):
+        def __init__(self, city_dict, client):
+            super().__init__(city_dict)
+            self.calculate_fitness_async = BatchingAdapter(client.score_roads)
+
+    async def main():
+        solver = AsyncGASolver(RemoteProblem(city_dict, client))
+        await solver.reset_population()
+        await solver.evolve_until(100)
+"""
+import asyncio
+
+from .GA_Solver_Isabela_Jose import GASolver
+from .generation_stats import print_stats
+
+
+class BatchingAdapter:
+    """Coroutine function scoring one chromosome, which groups the calls made
+    at about the same time into a single call of a bulk coroutine function"""
+
+    def __init__(self, calculate_batch, max_batch_size=64, max_delay=0.005):
+        """Initializes an adapter
+
+        Args:
+            calculate_batch (coroutine function): scores a list of chromosomes,
+            returning the list of their fitness
+            max_batch_size (int, optional): number of pending calls sent at
+            once. Defaults to 64.
+            max_delay (float, optional): seconds a call waits for others to
+            join its batch. Defaults to 0.005.
+        """
+        self._calculate_batch = calculate_batch
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._pending = []  # (chromosome, future) of the calls not sent yet
+        self._timer = None
+        self._tasks = set()  # Running bulk calls (the loop keeps weak references)
+        self.nb_batches = 0
+
+    async def __call__(self, chromosome):
+        """Fitness of a chromosome, calculated in the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((chromosome, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        """Send the pending calls as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch):
+        """Call the bulk function and resolve the futures of the batch"""
+        self.nb_batches += 1
+        try:
+            results = await self._calculate_batch([chromosome for chromosome, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():  # A call may have timed out meanwhile
+                    future.set_exception(error)
+            return
+        for (_, future), fitness in zip(batch, results):
+            if not future.done():
+                future.set_result(fitness)
+
+
+class AsyncGASolver(GASolver):
+    def __init__(self, problem, selection_rate=0.5, mutation_rate=0.1,
+                 max_concurrency=16, timeout=None, retries=2, retry_delay=0.1,
+                 retry_on=(asyncio.TimeoutError, OSError), **options):
+        """Initializes an asynchronous GA solver for a given problem
+
+        Args:
+            problem (GAProblem): An instance of a GAProblem to solve
+            selection_rate (float, optional): Defaults to 0.5.
+            mutation_rate (float, optional): Defaults to 0.1.
+            max_concurrency (int, optional): Maximum number of fitness
+                calculations awaited at the same time. Defaults to 16.
+            timeout (float, optional): Seconds allowed to each attempt at
+                calculating a fitness, None for no limit. Defaults to None.
+            retries (int, optional): Number of new attempts after a failed one.
+                Defaults to 2.
+            retry_delay (float, optional): Seconds before the first retry,
+                doubled at each following one. Defaults to 0.1.
+            retry_on (tuple, optional): Exception types causing a retry, the
+                others are raised at once. Defaults to timeouts and OSError
+                (which includes connection errors).
+            **options: the other options of GASolver (cache_size, selection,
+                memetic_rate, generational_gap, suppress_duplicates,
+                instrumentation, adaptive), except parallel
+        """
+        if options.get('parallel'):
+            raise ValueError("AsyncGASolver does not use worker processes")
+        super().__init__(problem, selection_rate, mutation_rate, **options)
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._retry_on = retry_on
+        self.nb_retries = 0
+
+    async def reset_population(self, pop_size=50):
+        """Initialize the population with pop_size random Individuals"""
+        await self._drive_async(self._reset_steps(pop_size))
+
+    async def evolve_for_one_generation(self):
+        """Same as GASolver.evolve_for_one_generation, the fitness of each
+        step being calculated concurrently"""
+        await self._drive_async(self._generation_steps())
+
+    async def _drive_async(self, steps):
+        """Same as GASolver._drive, awaiting the fitness values"""
+        fitnesses = None
+        try:
+            while True:
+                fitnesses = await self._evaluate_async(steps.send(fitnesses))
+        except StopIteration:
+            pass
+
+    async def run(self, max_nb_of_generations=500, track_diversity=False):
+        """Asynchronous generator version of GASolver.run"""
+        for _ in range(max_nb_of_generations):
+            start = self._start_generation()
+            await self.evolve_for_one_generation()
+            yield self._finish_generation(start, track_diversity)
+
+    async def evolve_until(self, max_nb_of_generations=500, threshold_fitness=None,
+                           callbacks=(), stop_when=(), log_every=0, track_diversity=False):
+        """Coroutine version of GASolver.evolve_until (callbacks and
+        predicates are regular functions)"""
+        callbacks = list(callbacks)
+        stop_when = list(stop_when)
+        if log_every:
+            callbacks.append(print_stats(log_every))
+        stats = None
+        async for stats in self.run(max_nb_of_generations, track_diversity):
+            if self._should_stop(stats, callbacks, threshold_fitness, stop_when):
+                break
+        return stats
+
+    def _evaluate(self, chromosomes):
+        raise TypeError("AsyncGASolver calculates fitness values with coroutines, "
+                        "await its methods instead")
+
+    async def _evaluate_async(self, chromosomes):
+        """Return the fitness of a list of chromosomes, from the cache if enabled"""
+        with self._phase('evaluation'):
+            if self._cache is None:
+                return await self._calculate_async(chromosomes)
+            keys = [self.problem.fingerprint(chromosome) for chromosome in chromosomes]
+            return await self._cache.evaluate_async(chromosomes, keys, self._calculate_async)
+
+    async def _calculate_async(self, chromosomes):
+        """Calculate the fitness of a list of chromosomes concurrently"""
+        self._evaluations += len(chromosomes)
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        return await asyncio.gather(*(self._calculate_one(chromosome, semaphore)
+                                      for chromosome in chromosomes))
+
+    async def _calculate_one(self, chromosome, semaphore):
+        """Calculate the fitness of a chromosome, with timeout and retries"""
+        async with semaphore:
+            for attempt in range(self._retries + 1):
+                try:
+                    return await asyncio.wait_for(
+                        self.problem.calculate_fitness_async(chromosome), self._timeout)
+                except self._retry_on:
+                    if attempt == self._retries:
+                        raise
+                    self.nb_retries += 1
+                    await asyncio.sleep(self._retry_delay * 2 ** attempt)
@@ -0,0 +1,221 @@
+"""
+Benchmark of the generic GA solver on the Mastermind and TSP problems.
+
+For every combination of problem size (Mastermind secret_size or number of
+TSP cities), population size and execution mode, it measures generations
+per second, fitness evaluations per second, time to reach the target
+fitness (Mastermind only, the TSP optimum being unknown) and, optionally,
+the peak memory of a second traced run. TSP instances are generated at
+random and written in the cities.txt format. Results are written as JSON,
+and two result files can be compared to catch regressions between commits:
+
+    python -m genetic_part3 benchmark --output before.json
+    python -m genetic_part3 benchmark --output after.json --compare before.json
+
+With --mastermind-strategies, it also compares the number of queries made to
+the codemaker (rate_guess calls for the GA, feedback calls for the
+consistent-set solver) to find Mastermind secrets.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from genetic_part1 import mastermind as mm
+from genetic_part1.consistent_solver import ConsistentSetSolver
+from genetic_part2 import cities
+from .GA_Solver_Isabela_Jose import GASolver
+from .mastermind_problem import MastermindProblem
+from .tsp_problem import TSProblem
+from .vectorized_solver import VectorizedGASolver
+
+MODES = ('serial', 'cache', 'parallel', 'vectorized')
+
+
+def random_cities(nb_cities, size=1000):
+    """Generate nb_cities cities at random integer coordinates in a square"""
+    return {f"City {i}": (random.randint(0, size), random.randint(0, size))
+            for i in range(nb_cities)}
+
+
+def make_problem(problem_name, size, workdir):
+    """Return (problem, target fitness or None) for a problem of a given size"""
+    if problem_name == 'mastermind':
+        match = mm.MastermindMatch(secret_size=size)
+        return MastermindProblem(match), match.max_score()
+    filename = os.path.join(workdir, f"cities_{size}.txt")
+    if not os.path.exists(filename):
+        cities.save_cities(random_cities(size), filename)
+    return TSProblem(cities.load_cities(filename)), None
+
+
+def make_solver(mode, problem, pop_size, n_workers):
+    """Return a solver running in the given execution mode"""
+    if mode == 'cache':
+        return GASolver(problem, cache_size=10 * pop_size)
+    if mode == 'parallel':
+        chunk_size = max(1, pop_size // (4 * (n_workers or os.cpu_count())))
+        return GASolver(problem, parallel=True, n_workers=n_workers, chunk_size=chunk_size)
+    if mode == 'vectorized':
+        return VectorizedGASolver(problem)
+    return GASolver(problem)
+
+
+def run_case(problem_name, size, pop_size, mode, generations, seed, workdir,
+             n_workers=None, trace_memory=False):
+    """Run one benchmark case and return its measures as a dictionary"""
+    random.seed(seed)
+    problem, target = make_problem(problem_name, size, workdir)
+    solver = make_solver(mode, problem, pop_size, n_workers)
+    if trace_memory:
+        tracemalloc.start()
+    with solver:
+        start = time.perf_counter()
+        solver.reset_population(pop_size)
+        evolution_start = time.perf_counter()
+        time_to_target = None
+        stats = None
+        for stats in solver.run(generations):
+            if target is not None and time_to_target is None and stats.best_fitness >= target:
+                time_to_target = time.perf_counter() - start
+        end = time.perf_counter()
+    peak_memory = None
+    if trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        'problem': problem_name,
+        'size': size,
+        'pop_size': pop_size,
+        'mode': mode,
+        'generations': generations,
+        'seconds': end - start,
+        'generations_per_second': generations / (end - evolution_start),
+        'evaluations': solver.evaluations,
+        'evaluations_per_second': solver.evaluations / (end - start),
+        'cache_hits': solver.cache_hits,
+        'best_fitness': stats.best_fitness if stats is not None else None,
+        'time_to_target': time_to_target,
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def run_benchmark(problems, sizes, pop_sizes, modes, generations, seed,
+                  n_workers=None, memory=False):
+    """Run every combination of the parameters and return the list of results"""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for problem_name in problems:
+            for size in sizes[problem_name]:
+                for pop_size in pop_sizes:
+                    for mode in modes:
+                        result = run_case(problem_name, size, pop_size, mode,
+                                          generations, seed, workdir, n_workers)
+                        if memory and mode != 'parallel':  # Workers would not be traced
+                            traced = run_case(problem_name, size, pop_size, mode,
+                                              generations, seed, workdir, n_workers, True)
+                            result['peak_memory_bytes'] = traced['peak_memory_bytes']
+                        print(f"{problem_name:10} size={size:<6} pop={pop_size:<7} {mode:10} "
+                              f"{result['generations_per_second']:10.1f} gen/s "
+                              f"{result['evaluations_per_second']:12.1f} eval/s")
+                        results.append(result)
+    return results
+
+
+def compare_mastermind_strategies(secret_sizes, seed, pop_size=100, max_nb_of_generations=2000):
+    """Number of codemaker queries needed to find a secret, by the GA and by
+    each strategy of the consistent-set solver"""
+    results = []
+    for secret_size in secret_sizes:
+        random.seed(seed)
+        match = mm.MastermindMatch(secret_size=secret_size)
+        solver = GASolver(MastermindProblem(match), cache_size=10 * pop_size)
+        solver.reset_population(pop_size)
+        solver.evolve_until(max_nb_of_generations, threshold_fitness=match.max_score())
+        solved = match.is_correct(mm.decode_guess(solver.get_best_individual().chromosome))
+        # Incremental mutant scores compare pegs with the secret too
+        rows = [('GASolver', solver.evaluations + solver.delta_evaluations, solved)]
+        for strategy in ConsistentSetSolver.STRATEGIES:
+            consistent_solver = ConsistentSetSolver(match, strategy, seed=seed)
+            guess = consistent_solver.solve()
+            rows.append((f"consistent/{strategy}", len(consistent_solver.history),
+                         match.is_correct(guess)))
+        for name, queries, solved in rows:
+            print(f"mastermind size={secret_size:<3} {name:22} {queries:8} queries solved={solved}")
+            results.append({'secret_size': secret_size, 'solver': name,
+                            'queries': queries, 'solved': solved})
+    return results
+
+
+def _git_commit():
+    """Current commit of the repository, None if unknown"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """Print the throughput change of every case also present in the baseline"""
+    def key(result):
+        return result['problem'], result['size'], result['pop_size'], result['mode']
+    previous = {key(result): result for result in baseline}
+    for result in results:
+        before = previous.get(key(result))
+        if before is None:
+            continue
+        change = result['generations_per_second'] / before['generations_per_second'] - 1
+        print(f"{result['problem']:10} size={result['size']:<6} pop={result['pop_size']:<7} "
+              f"{result['mode']:10} {change:+8.1%} gen/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m genetic_part3 benchmark',
+                                     description=__doc__.split('\n\n')[0])
+    parser.add_argument('--problems', nargs='+', default=['mastermind', 'tsp'],
+                        choices=['mastermind', 'tsp'])
+    parser.add_argument('--secret-sizes', nargs='+', type=int, default=[4, 8, 16])
+    parser.add_argument('--city-counts', nargs='+', type=int, default=[50, 200, 1000])
+    parser.add_argument('--pop-sizes', nargs='+', type=int, default=[100, 1000])
+    parser.add_argument('--modes', nargs='+', default=['serial', 'cache', 'vectorized'],
+                        choices=MODES)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory', action='store_true',
+                        help="measure the peak memory in a second, traced run")
+    parser.add_argument('--mastermind-strategies', action='store_true',
+                        help="compare the GA with the consistent-set Mastermind solver")
+    parser.add_argument('--output', help="JSON file receiving the results")
+    parser.add_argument('--compare', help="JSON results of a previous run to compare with")
+    args = parser.parse_args(argv)
+
+    sizes = {'mastermind': args.secret_sizes, 'tsp': args.city_counts}
+    results = run_benchmark(args.problems, sizes, args.pop_sizes, args.modes,
+                            args.generations, args.seed, args.workers, args.memory)
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    if args.mastermind_strategies:
+        report['mastermind_strategies'] = compare_mastermind_strategies(
+            args.secret_sizes, args.seed)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Checkpoints of GA runs, to resume a long run after a crash.
+
+A checkpoint is a compact binary file holding the genes of the whole
+population as one flat array, the fitness values as one array of doubles,
+the generation counter, the cache counters and the state of the solver's
+random generator (as a short JSON text). Chromosomes must all be integer
+sequences of the same length; they are restored as array.array objects.
+
+Files are written atomically: the data goes to a temporary file of the same
+directory, which then replaces the checkpoint, so a crash while writing
+never leaves a truncated checkpoint behind.
+"""
+from array import array
+from typing import NamedTuple
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+_MAGIC = b'GACKPT1\n'
+# generation, population size, chromosome length, cache hits, cache misses,
+# gene typecode, byte order ('<' or '>'), length of the random state text
+_HEADER = struct.Struct('<QQQQQccI')
+
+
+class Checkpoint(NamedTuple):
+    """State of a GA run"""
+    generation: int
+    typecode: str  # array typecode of the genes
+    chromosome_length: int
+    genes: array  # Genes of all the chromosomes, one after the other
+    fitness: array  # array('d') of the fitness of each chromosome
+    rng_state: object  # JSON-compatible state of the solver's random generator
+    cache_hits: int
+    cache_misses: int
+
+
+def save(path, checkpoint: Checkpoint):
+    """Atomically write a checkpoint to a file"""
+    rng_state = json.dumps(checkpoint.rng_state).encode()
+    header = _HEADER.pack(checkpoint.generation, len(checkpoint.fitness),
+                          checkpoint.chromosome_length, checkpoint.cache_hits,
+                          checkpoint.cache_misses, checkpoint.typecode.encode(),
+                          b'<' if sys.byteorder == 'little' else b'>', len(rng_state))
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='.checkpoint-', delete=False) as file:
+        try:
+            file.write(_MAGIC)
+            file.write(header)
+            file.write(rng_state)
+            checkpoint.fitness.tofile(file)
+            checkpoint.genes.tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+    os.replace(file.name, path)
+
+
+def load(path) -> Checkpoint:
+    """Read a checkpoint written by save"""
+    with open(path, 'rb') as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{path} is not a GA checkpoint")
+        (generation, pop_size, length, hits, misses,
+         typecode, byteorder, rng_length) = _HEADER.unpack(file.read(_HEADER.size))
+        rng_state = json.loads(file.read(rng_length))
+        fitness = array('d')
+        fitness.fromfile(file, pop_size)
+        genes = array(typecode.decode())
+        genes.fromfile(file, pop_size * length)
+    if byteorder != (b'<' if sys.byteorder == 'little' else b'>'):
+        fitness.byteswap()
+        genes.byteswap()
+    return Checkpoint(generation, typecode.decode(), length, genes, fitness,
+                      rng_state, hits, misses)
+
+
+class CheckpointWriter:
+    """evolve_until callback saving a checkpoint of the solver periodically.
+
+    The population is copied on the main thread (a few flat array copies);
+    writing the file is done on a background thread, so evolution does not
+    wait for the disk. If the previous write is still running when a new
+    checkpoint is due, the new one is skipped.
+    """
+
+    def __init__(self, path, interval=300.0):
+        """Initializes a writer
+
+        Args:
+            path (str): the checkpoint file, replaced at every save
+            interval (float, optional): minimum number of seconds between two
+            checkpoints. Defaults to 300.
+        """
+        self.path = path
+        self.interval = interval
+        self._last_save = time.monotonic()
+        self._thread = None
+
+    def __call__(self, solver, stats):
+        """Save a checkpoint of the solver if interval seconds have passed"""
+        now = time.monotonic()
+        if now - self._last_save < self.interval:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._last_save = now
+        self._thread = threading.Thread(target=save, args=(self.path, solver.checkpoint()))
+        self._thread.start()
+
+    def close(self):
+        """Wait for the pending write, if any"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
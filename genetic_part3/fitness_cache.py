@@ -0,0 +1,90 @@
+"""
+Bounded memoization of fitness values for the generic GA solver.
+
+Chromosomes are identified by a hashable fingerprint (see
+GAProblem.fingerprint). When the cache is full, the least recently used
+entry is evicted.
+"""
+from collections import OrderedDict
+
+
+class FitnessCache:
+    """LRU cache mapping chromosome fingerprints to fitness values"""
+
+    def __init__(self, max_size: int):
+        """Initializes an empty cache
+
+        Args:
+            max_size (int): maximum number of fitness values kept
+        """
+        if max_size <= 0:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def __len__(self):
+        """Number of fitness values currently kept"""
+        return len(self._values)
+
+    def clear(self):
+        """Remove all the fitness values and reset the counters"""
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def evaluate(self, chromosomes: list, keys: list, calculate) -> list:
+        """Return the fitness of each chromosome, calculating only the missing ones
+
+        Args:
+            chromosomes (list): the chromosomes to score
+            keys (list): the fingerprint of each chromosome
+            calculate (callable): function scoring a list of chromosomes, called
+                once with the chromosomes that are not in the cache (a chromosome
+                repeated in the list is calculated only once)
+
+        Returns:
+            list: the fitness of each chromosome
+        """
+        fitnesses, missing = self._lookup(keys)
+        if missing:
+            self._store(fitnesses, missing,
+                        calculate([chromosomes[indices[0]] for indices in missing.values()]))
+        return fitnesses
+
+    async def evaluate_async(self, chromosomes: list, keys: list, calculate) -> list:
+        """Same as evaluate, calculate being a coroutine function"""
+        fitnesses, missing = self._lookup(keys)
+        if missing:
+            self._store(fitnesses, missing,
+                        await calculate([chromosomes[indices[0]] for indices in missing.values()]))
+        return fitnesses
+
+    def _lookup(self, keys):
+        """Fitness found in the cache for each key (None if missing), and the
+        indices of the missing ones, by key"""
+        values = self._values
+        fitnesses = [None] * len(keys)
+        missing = {}  # fingerprint -> indices of the chromosomes having it
+        for i, key in enumerate(keys):
+            if key in values:
+                values.move_to_end(key)
+                fitnesses[i] = values[key]
+            elif key in missing:
+                missing[key].append(i)
+            else:
+                missing[key] = [i]
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        return fitnesses, missing
+
+    def _store(self, fitnesses, missing, computed):
+        """Keep the calculated fitness values, and fill them in fitnesses"""
+        values = self._values
+        for (key, indices), fitness in zip(missing.items(), computed):
+            for i in indices:
+                fitnesses[i] = fitness
+            values[key] = fitness
+        while len(values) > self.max_size:
+            values.popitem(last=False)
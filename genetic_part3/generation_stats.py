@@ -0,0 +1,60 @@
+"""
+Per-generation statistics yielded by GASolver.run, with ready-made
+callbacks and early-stopping predicates for GASolver.evolve_until.
+
+A callback is called as callback(solver, stats) after every generation; an
+early-stopping predicate is called as predicate(stats) and stops the
+evolution when it returns True.
+"""
+from collections import Counter
+from math import log2
+from typing import NamedTuple, Optional
+
+
+class GenerationStats(NamedTuple):
+    """Summary of the population after one generation"""
+    generation: int  # Number of generations evolved so far, starting at 1
+    best: object  # Best Individual of the population
+    best_fitness: float
+    mean_fitness: float
+    diversity: Optional[float]  # Fraction of distinct chromosomes, None if not tracked
+    duration: float  # Time spent evolving this generation, in seconds
+    unique: Optional[int] = None  # Number of distinct chromosomes, None if not tracked
+    gene_entropy: Optional[float] = None  # See gene_entropy, None if not tracked
+
+
+def gene_entropy(chromosomes) -> float:
+    """Mean, over the gene positions, of the Shannon entropy (in bits) of the
+    genes found at that position in the chromosomes: 0 when they all agree,
+    log2(number of possible genes) at most when the population is diverse"""
+    n = len(chromosomes)
+    total = 0.0
+    length = 0
+    for genes in zip(*chromosomes):
+        length += 1
+        for count in Counter(genes).values():
+            total -= count / n * log2(count / n)
+    return total / length if length else 0.0
+
+
+def print_stats(every=1):
+    """Callback printing the stats every given number of generations"""
+    def callback(solver, stats):
+        if stats.generation % every == 0:
+            print(f"Generation {stats.generation}: Best fitness = {stats.best_fitness:.2f}")
+    return callback
+
+
+def no_improvement(patience):
+    """Early-stopping predicate: stop when the best fitness has not improved
+    for patience generations"""
+    best_fitness = None
+    last_improvement = 0
+
+    def predicate(stats):
+        nonlocal best_fitness, last_improvement
+        if best_fitness is None or stats.best_fitness > best_fitness:
+            best_fitness = stats.best_fitness
+            last_improvement = stats.generation
+        return stats.generation - last_improvement >= patience
+    return predicate
@@ -0,0 +1,141 @@
+"""
+Instrumentation of GA runs: where does a generation spend its time?
+
+An Instrumentation given to a solver (GASolver(..., instrumentation=...))
+records, for every generation, the time spent in each phase of
+evolve_for_one_generation ('selection', 'crossover', 'mutation',
+'local_search', 'replacement' and 'evaluation', the fitness calculations
+of all the phases) and the counters of the solver during that generation
+(evaluations, incremental evaluations, cache hits and misses, re-mutated
+duplicates, chromosomes created). The records can be exported to CSV or
+JSON, to compare the phases of different problems and settings:
+
+    instrumentation = Instrumentation(profile_generations=5)
+    solver = GASolver(problem, instrumentation=instrumentation)
+    solver.reset_population()
+    solver.evolve_until(100)
+    instrumentation.to_csv('phases.csv')
+    instrumentation.profile_stats().sort_stats('cumulative').print_stats(20)
+
+A phase costs two perf_counter calls; allocated memory (tracemalloc) and
+function-level profiling (cProfile, for the first generations only) are
+optional, being much more expensive.
+"""
+from contextlib import contextmanager
+import cProfile
+import csv
+import json
+import pstats
+import time
+import tracemalloc
+
+PHASES = ('selection', 'crossover', 'mutation', 'local_search', 'replacement', 'evaluation')
+COUNTERS = ('evaluations', 'delta_evaluations', 'cache_hits', 'cache_misses',
+            'duplicates', 'chromosomes')
+
+
+class Instrumentation:
+    """Per-generation phase timings and counters of a solver"""
+
+    def __init__(self, profile_generations=0, profile_path=None, trace_memory=False):
+        """Initializes an empty record
+
+        Args:
+            profile_generations (int, optional): number of generations, from the
+            first one, run under cProfile. Defaults to 0.
+            profile_path (str, optional): file receiving the profile (readable
+            by pstats and snakeviz), written once profiling ends. Defaults to None.
+            trace_memory (bool, optional): also record the memory allocated and
+            the peak memory of each generation, with tracemalloc. Defaults to False.
+        """
+        self.records = []  # One dictionary per generation
+        self.chromosomes = 0  # Chromosomes created by the solver, counted by it
+        self._profile_generations = profile_generations
+        self._profile_path = profile_path
+        self._profiler = None
+        self._profiled = 0
+        self._trace_memory = trace_memory
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._counters = None
+        self._start = None
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager adding the time spent in it to a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._times[name] += time.perf_counter() - start
+
+    def _read_counters(self, solver):
+        return {'evaluations': solver.evaluations,
+                'delta_evaluations': solver.delta_evaluations,
+                'cache_hits': solver.cache_hits,
+                'cache_misses': solver.cache_misses,
+                'duplicates': solver.duplicates,
+                'chromosomes': self.chromosomes}
+
+    def start_generation(self, solver):
+        """Called by the solver before evolving a generation"""
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._counters = self._read_counters(solver)
+        if self._profiled < self._profile_generations:
+            if self._profiler is None:
+                self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self._trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def end_generation(self, solver):
+        """Called by the solver after evolving a generation: add its record"""
+        duration = time.perf_counter() - self._start
+        if self._profiler is not None and self._profiled < self._profile_generations:
+            self._profiler.disable()
+            self._profiled += 1
+            if self._profiled == self._profile_generations and self._profile_path:
+                self._profiler.dump_stats(self._profile_path)
+        record = {'generation': solver.generation, 'duration': duration}
+        record.update(self._times)
+        counters = self._read_counters(solver)
+        for name in COUNTERS:
+            record[name] = counters[name] - self._counters[name]
+        if self._trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record['allocated_bytes'] = current - self._memory
+            record['peak_bytes'] = peak - self._memory
+        self.records.append(record)
+
+    def totals(self):
+        """Total time of each phase and total of each counter, over all the
+        generations recorded"""
+        totals = {}
+        for record in self.records:
+            for name, value in record.items():
+                if name != 'generation':
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def profile_stats(self):
+        """pstats.Stats of the profiled generations, None if none was profiled"""
+        if self._profiler is None:
+            return None
+        return pstats.Stats(self._profiler)
+
+    def to_csv(self, path):
+        """Write the per-generation records to a CSV file"""
+        if not self.records:
+            return
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.records[0]))
+            writer.writeheader()
+            writer.writerows(self.records)
+
+    def to_json(self, path):
+        """Write the per-generation records and their totals to a JSON file"""
+        with open(path, 'w') as file:
+            json.dump({'generations': self.records, 'totals': self.totals()}, file, indent=2)
@@ -0,0 +1,182 @@
+"""
+Island model for the generic GA solver.
+
+Several independent GASolver populations (the islands) evolve in parallel,
+each one in its own process. Every migration_interval generations, each
+island sends copies of its best Individuals to its neighbours, which replace
+their worst Individuals with them. Migrants travel through one
+multiprocessing queue per island, so an island never waits for a slower
+neighbour: it takes the migrants that have arrived when it migrates.
+
+Each island's solver is seeded with its own stream, spawned from the seed
+of the model. In synchronous mode, an island instead waits for the migrants
+of every one of its senders at each migration, and the islands stop at a
+migration (or after their last generation) rather than as soon as another
+island is solved: the same seed then gives the same results, whatever the
+speed of the processes.
+"""
+from collections import deque
+import multiprocessing as mp
+import queue
+
+import numpy as np
+
+from .GA_Solver_Isabela_Jose import GAProblem, GASolver
+
+TOPOLOGIES = ('ring', 'all-to-all')
+
+
+def _neighbours(index, n_islands, topology):
+    """Return the islands receiving the migrants of island index"""
+    if topology == 'ring':
+        return [(index + 1) % n_islands] if n_islands > 1 else []
+    return [i for i in range(n_islands) if i != index]
+
+
+def _receive(inbox, senders, pending):
+    """Wait for the next message of every sender, in sender order. Messages
+    of a sender that is ahead are kept in pending for the next migrations."""
+    while not all(pending[sender] for sender in senders):
+        sender, message = inbox.get()
+        pending[sender].append(message)
+    return [pending[sender].popleft() for sender in senders]
+
+
+def _run_island(index, problem, solver_class, solver_options, pop_size,
+                max_nb_of_generations, threshold_fitness, migration_interval,
+                migration_size, inbox, outboxes, stop, results, senders=None):
+    """Process target: evolve one island and report its best Individual. The
+    migration is synchronous when the islands sending to this one (senders)
+    are given."""
+    solver = solver_class(problem, **solver_options)
+    solver.reset_population(pop_size)
+    pending = {sender: deque() for sender in senders or ()}
+    generation = 0
+    while generation < max_nb_of_generations and not stop.is_set():
+        solver.evolve_for_one_generation()
+        generation += 1
+        solved = threshold_fitness is not None \
+            and solver.get_best_individual().fitness >= threshold_fitness
+
+        if senders is not None:
+            # Each message is (migrants, stopping): a stopping island sends
+            # no more migrants, and stops its receivers at their next migration
+            if solved:
+                for outbox in outboxes:
+                    outbox.put((index, (None, True)))
+                break
+            if generation % migration_interval == 0:
+                for outbox in outboxes:
+                    outbox.put((index, (solver.get_top_individuals(migration_size), False)))
+                messages = _receive(inbox, senders, pending)
+                if any(stopping for _, stopping in messages):
+                    for outbox in outboxes:
+                        outbox.put((index, (None, True)))
+                    break
+                solver.replace_worst([migrant for migrants, _ in messages
+                                      for migrant in migrants])
+            continue
+
+        if generation % migration_interval == 0:
+            migrants = solver.get_top_individuals(migration_size)
+            for outbox in outboxes:
+                outbox.put(migrants)
+            arrived = []
+            while True:
+                try:
+                    arrived.extend(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            if arrived:
+                solver.replace_worst(arrived)
+
+        if solved:
+            stop.set()  # Tell the other islands that the problem is solved
+
+    for outbox in outboxes:
+        outbox.cancel_join_thread()  # Do not wait for neighbours to read the last migrants
+    results.put((index, solver.get_best_individual()))
+
+
+class IslandModel:
+    def __init__(self, problem: GAProblem, n_islands=4, migration_interval=10,
+                 migration_size=2, topology='ring', solver_class=GASolver,
+                 seed=None, synchronous=False, **solver_options):
+        """Initializes an island model for a given problem
+
+        Args:
+            problem (GAProblem): An instance of a GAProblem to solve, which must
+                be picklable
+            n_islands (int, optional): Number of populations, each one evolved in
+                its own process. Defaults to 4.
+            migration_interval (int, optional): Number of generations between two
+                migrations. Defaults to 10.
+            migration_size (int, optional): Number of Individuals sent by an island
+                to each of its neighbours. Defaults to 2.
+            topology (str, optional): 'ring' (each island sends to the next one)
+                or 'all-to-all'. Defaults to 'ring'.
+            solver_class (type, optional): Solver evolving each island.
+                Defaults to GASolver.
+            seed (int, optional): Seed of the islands' solvers, each one
+                receiving an independent stream spawned from it. Defaults to
+                None (unpredictable seeds).
+            synchronous (bool, optional): Wait for the migrants of every
+                sender at each migration, so that runs with the same seed give
+                the same results. Defaults to False.
+            **solver_options: other arguments of the solver_class constructor
+                (selection_rate, mutation_rate, ...)
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+        self.problem = problem
+        self._n_islands = n_islands
+        self._migration_interval = migration_interval
+        self._migration_size = migration_size
+        self._topology = topology
+        self._solver_class = solver_class
+        self._seed = seed
+        self._synchronous = synchronous
+        self._solver_options = solver_options
+        self.island_bests = []
+
+    def run(self, pop_size=50, max_nb_of_generations=500, threshold_fitness=None):
+        """Evolve all the islands until a condition is met:
+        - Max number of generations is reached by every island, or
+        - One island reaches a sufficiently high fitness value
+
+        Args:
+            pop_size (int, optional): Population size of each island. Defaults to 50.
+            max_nb_of_generations (int, optional): Defaults to 500.
+            threshold_fitness (float, optional): Defaults to None.
+
+        Returns:
+            Individual: the best Individual over all the islands
+        """
+        inboxes = [mp.Queue() for _ in range(self._n_islands)]
+        stop = mp.Event()
+        results = mp.Queue()
+        islands = []
+        seeds = np.random.SeedSequence(self._seed).spawn(self._n_islands)
+        receivers = [_neighbours(index, self._n_islands, self._topology)
+                     for index in range(self._n_islands)]
+        for index in range(self._n_islands):
+            outboxes = [inboxes[i] for i in receivers[index]]
+            senders = [i for i in range(self._n_islands) if index in receivers[i]] \
+                if self._synchronous else None
+            options = dict(self._solver_options, seed=seeds[index])
+            island = mp.Process(target=_run_island, args=(
+                index, self.problem, self._solver_class, options, pop_size,
+                max_nb_of_generations, threshold_fitness, self._migration_interval,
+                self._migration_size, inboxes[index], outboxes, stop, results, senders))
+            island.start()
+            islands.append(island)
+
+        # Read the results before joining: a process does not end while its
+        # queued data has not been consumed
+        self.island_bests = [None] * self._n_islands
+        for _ in islands:
+            index, best = results.get()
+            self.island_bests[index] = best
+        for island in islands:
+            island.join()
+        return max(self.island_bests, key=lambda ind: ind.fitness)
@@ -0,0 +1,182 @@
+"""
+Local search improving TSP roads, for the memetic stage of the GA solver.
+
+Roads are sequences of city positions (see cities.DistanceIndex). Both
+searches only try moves that create an edge between a city and one of its k
+nearest neighbours, and use don't-look bits: a city is only examined again
+when one of its edges changed. A pass therefore costs about n * k distance
+lookups instead of the n^2 of an exhaustive search (the neighbour lists come
+from cities.SpatialIndex), plus the cost of the accepted moves:
+- 2-opt replaces two edges by reversing the segment between them (the
+  shorter side of the road, so up to n / 2 cities per move),
+- Or-opt moves a segment of 1 to 3 cities elsewhere in the road, possibly
+  reversed, in constant time on a linked road.
+"""
+from collections import deque
+
+EPSILON = 1e-9  # Minimal gain of a move, to avoid looping on rounding errors
+
+
+def _reverse(road, position, i, j):
+    """Reverse the cyclic segment road[i..j] (inclusive), or its complement
+    if that is shorter (which gives the same road, in the other direction)"""
+    n = len(road)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+    for _ in range(length // 2):
+        road[i], road[j] = road[j], road[i]
+        position[road[i]] = i
+        position[road[j]] = j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+
+def two_opt(road, distances, neighbours):
+    """Improve a road with 2-opt moves until none is found
+
+    Args:
+        road (list[int]): the road, modified in place
+        distances (cities.DistanceIndex): the distances between the cities
+        neighbours (list[list[int]]): candidate neighbours of each city
+
+    Returns:
+        float: the (negative) change of length of the road
+    """
+    n = len(road)
+    if n < 5:
+        return 0.0
+    d = distances.between
+    position = [0] * n
+    for i, city in enumerate(road):
+        position[city] = i
+    queue = deque(road)
+    queued = [True] * n  # Cities whose don't-look bit is off
+    total = 0.0
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        for forward in (True, False):
+            i = position[a]
+            b = road[(i + 1) % n] if forward else road[i - 1]
+            d_ab = d(a, b)
+            for c in neighbours[a]:
+                d_ac = d(a, c)
+                if d_ac >= d_ab:
+                    break  # Neighbours are sorted: no further gain possible
+                j = position[c]
+                e = road[(j + 1) % n] if forward else road[j - 1]
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d(b, e) - d_ab - d(c, e)
+                if delta < -EPSILON:
+                    # New edges (a, c) and (b, e)
+                    if forward:
+                        _reverse(road, position, (i + 1) % n, j)
+                    else:
+                        _reverse(road, position, j, (i - 1) % n)
+                    total += delta
+                    for city in (a, b, c, e):
+                        if not queued[city]:
+                            queued[city] = True
+                            queue.append(city)
+                    break
+            else:
+                continue
+            break  # The road changed: a is queued again, examine it later
+    return total
+
+
+def or_opt(road, distances, neighbours, max_segment=3):
+    """Improve a road by moving segments of 1 to max_segment cities between
+    a neighbouring city and its successor, until no move is found. The road
+    is kept as successor and predecessor links during the search, so a move
+    only changes the links around the segment and its new place.
+
+    Args:
+        road (list[int]): the road, modified in place
+        distances (cities.DistanceIndex): the distances between the cities
+        neighbours (list[list[int]]): candidate neighbours of each city
+        max_segment (int, optional): longest segment moved. Defaults to 3.
+
+    Returns:
+        float: the (negative) change of length of the road
+    """
+    n = len(road)
+    if n < max_segment + 3:
+        return 0.0
+    d = distances.between
+    successor = [0] * n
+    predecessor = [0] * n
+    for i, city in enumerate(road):
+        successor[city] = road[(i + 1) % n]
+        predecessor[city] = road[i - 1]
+    queue = deque(road)
+    queued = [True] * n
+    total = 0.0
+    while queue:
+        first = queue.popleft()
+        queued[first] = False
+        move = None
+        segment = []
+        last = predecessor[first]
+        for length in range(1, max_segment + 1):
+            last = successor[last]
+            segment.append(last)
+            before, after = predecessor[first], successor[last]
+            removal_gain = d(before, first) + d(last, after) - d(before, after)
+            if removal_gain <= EPSILON:
+                continue
+            for end in (first, last):
+                for c in neighbours[end]:
+                    if c in segment:
+                        continue
+                    e = successor[c]  # Insert between c and e
+                    if e in segment:
+                        continue
+                    # Attach end to c: the segment goes c, end, ..., other end, e
+                    other = last if end == first else first
+                    delta = d(c, end) + d(other, e) - d(c, e) - removal_gain
+                    if delta < -EPSILON:
+                        move = (c, e, end, other, delta)
+                        break
+                if move:
+                    break
+            if move:
+                break
+        if move is None:
+            continue
+        c, e, end, other, delta = move
+        # Unlink the segment, then link it between c and e
+        successor[before] = after
+        predecessor[after] = before
+        ordered = segment if end == first else segment[::-1]
+        for a, b in zip([c] + ordered, ordered + [e]):
+            successor[a] = b
+            predecessor[b] = a
+        total += delta
+        for city in segment + [c, before, after]:
+            if not queued[city]:
+                queued[city] = True
+                queue.append(city)
+    city = road[0]
+    for i in range(n):
+        road[i] = city
+        city = successor[city]
+    return total
+
+
+def improve(road, distances, neighbours, max_rounds=3):
+    """Alternate 2-opt and Or-opt until neither improves the road
+
+    Returns:
+        float: the (negative) change of length of the road, modified in place
+    """
+    total = 0.0
+    for _ in range(max_rounds):
+        gain = two_opt(road, distances, neighbours) + or_opt(road, distances, neighbours)
+        total += gain
+        if gain >= -EPSILON:
+            break
+    return total
@@ -7,27 +7,104 @@ Created on Thu Feb 18 2022
 Template file for your Exercise 3 submission 
 (GA solving Mastermind example)
 """
-from ga_solver import GAProblem
-import mastermind as mm
+from array import array
+
+import numpy as np
+
+from genetic_part1 import mastermind as mm
+from .GA_Solver_Isabela_Jose import GAProblem
 
 
 class MastermindProblem(GAProblem):
-    """Implementation of GAProblem for the mastermind problem"""
-    pass  # REPLACE WITH YOUR CODE
+    """Implementation of GAProblem for the mastermind problem
+
+    Chromosomes are compact arrays of color indices (see mm.encode_guess),
+    decoded to color names only for reporting (see mm.decode_guess).
+    """
+
+    def __init__(self, match: mm.MastermindMatch):
+        """Initializes the problem of guessing the secret of a match
+
+        Args:
+            match (mm.MastermindMatch): the match to solve
+        """
+        self.match = match
+        self._nb_colors = len(mm.get_possible_colors())
+
+    def generate_random_chromosome(self):
+        """Generate a random guess"""
+        return array('B', mm.encode_guess(self.match.generate_random_guess(self.rng)))
+
+    def calculate_fitness(self, chromosome):
+        """Rate how close a guess is to the secret"""
+        return self.match.rate_encoded_guess(chromosome)
+
+    def calculate_fitness_batch(self, chromosomes):
+        """Rate a whole matrix of guesses at once"""
+        return self.match.rate_guesses(chromosomes)
+
+    def crossover(self, parent1, parent2):
+        """Single point crossover: beginning of parent1, end of parent2"""
+        x_point = self.rng.randrange(0, len(parent1))
+        child = array('B', parent1)
+        child[x_point:] = array('B', parent2[x_point:])
+        return child
+
+    def crossover_batch(self, parents1, parents2):
+        """Single point crossover of every pair of rows at once"""
+        parents1, parents2 = np.asarray(parents1), np.asarray(parents2)
+        m, n = parents1.shape
+        x_points = self.np_rng.integers(0, n, m)
+        return np.where(np.arange(n) >= x_points[:, None], parents2, parents1)
+
+    def mutate_batch(self, chromosomes):
+        """Replace the color of a random peg of every guess of a matrix at once"""
+        mutated = np.array(chromosomes)
+        m, n = mutated.shape
+        rng = self.np_rng
+        mutated[np.arange(m), rng.integers(0, n, m)] = rng.integers(0, self._nb_colors, m)
+        return mutated
+
+    mutation_operators = ('peg', 'swap')
+
+    def mutate(self, chromosome):
+        """Replace the color of a random peg by a random color"""
+        return self.mutate_with_move(chromosome)[0]
+
+    def mutate_with_move(self, chromosome, operator=None):
+        """Mutate a guess with one of the operators:
+        - 'peg' (default): replace the color of a random peg by a random color,
+        - 'swap': swap the colors of two random pegs.
+        The move is the tuple of the (peg position, new color) changes.
+        """
+        mutated = array('B', chromosome)
+        if operator in (None, 'peg'):
+            position = self.rng.randrange(0, len(mutated))
+            mutated[position] = self.rng.randrange(self._nb_colors)
+            return mutated, ((position, mutated[position]),)
+        i, j = self.rng.sample(range(len(mutated)), 2)
+        mutated[i], mutated[j] = mutated[j], mutated[i]
+        return mutated, ((i, mutated[i]), (j, mutated[j]))
 
+    def fitness_delta(self, chromosome, move):
+        """Each peg scores independently, so only the changed ones are rescored"""
+        peg_score = self.match.peg_score
+        return sum(peg_score(position, color) - peg_score(position, chromosome[position])
+                   for position, color in move)
 
 if __name__ == '__main__':
 
-    from ga_solver import GASolver
+    from .GA_Solver_Isabela_Jose import GASolver
 
     match = mm.MastermindMatch(secret_size=6)
     problem = MastermindProblem(match)
     solver = GASolver(problem)
 
     solver.reset_population()
-    solver.evolve_until()
+    solver.evolve_until(threshold_fitness=match.max_score(), log_every=10)
 
+    best = solver.get_best_individual()
     print(
-        f"Best guess {mm.decode_guess(solver.getBestDNA())} {solver.get_best_individual()}")
+        f"Best guess {mm.decode_guess(best.chromosome)} {best}")
     print(
-        f"Problem solved? {match.is_correct(solver.get_best_individual().chromosome)}")
+        f"Problem solved? {match.is_correct(mm.decode_guess(best.chromosome))}")
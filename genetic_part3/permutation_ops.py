@@ -0,0 +1,180 @@
+"""
+Crossover operators for permutation chromosomes (e.g. TSP roads).
+
+Chromosomes are sequences of the integers 0..n-1, each appearing once. Every
+operator builds a child in O(n), using a lookup table (indexed by gene) to
+know which genes are already placed or where a gene is in a parent, instead
+of searching the child. Operators take two parents and an optional random
+generator (the random module by default) and return the child as a list.
+
+The *_batch functions build one child per row of two 2-D numpy arrays of
+parents at once, with a numpy random Generator.
+"""
+import random
+
+import numpy as np
+
+
+def _cut_points(n, rng):
+    """Random segment [i, j) with 0 <= i < j <= n"""
+    i, j = sorted(rng.sample(range(n + 1), 2))
+    return i, j
+
+
+def one_point_order_crossover(parent1, parent2, rng=random):
+    """Beginning of parent1, then the remaining genes in the order of parent2"""
+    n = len(parent1)
+    x_point = rng.randint(1, n - 1)  # Avoid empty splits
+    child = list(parent1[:x_point])
+    taken = bytearray(n)
+    for gene in child:
+        taken[gene] = 1
+    child.extend(gene for gene in parent2 if not taken[gene])
+    return child
+
+
+def order_crossover(parent1, parent2, rng=random):
+    """OX: a random segment of parent1 stays in place, the other positions
+    are filled, from the end of the segment on (wrapping around), with the
+    remaining genes in the order of parent2 starting at the same point"""
+    n = len(parent1)
+    i, j = _cut_points(n, rng)
+    taken = bytearray(n)
+    for gene in parent1[i:j]:
+        taken[gene] = 1
+    child = list(parent1)
+    position = j % n
+    for k in range(n):
+        gene = parent2[(j + k) % n]
+        if not taken[gene]:
+            child[position] = gene
+            position = (position + 1) % n
+    return child
+
+
+def partially_mapped_crossover(parent1, parent2, rng=random):
+    """PMX: a random segment of parent1 is swapped into a copy of parent2,
+    gene by gene, so the other genes keep the position they have in parent2
+    whenever possible"""
+    n = len(parent1)
+    i, j = _cut_points(n, rng)
+    child = list(parent2)
+    position = [0] * n  # position[gene] = index of gene in child
+    for k, gene in enumerate(child):
+        position[gene] = k
+    for k in range(i, j):
+        gene, replaced = parent1[k], child[k]
+        other = position[gene]
+        child[k], child[other] = gene, replaced
+        position[gene], position[replaced] = k, other
+    return child
+
+
+def cycle_crossover(parent1, parent2, rng=random):
+    """CX: every gene keeps the position it has in one of the parents, taking
+    the cycles of positions alternately from parent1 and parent2"""
+    n = len(parent1)
+    position1 = [0] * n  # position1[gene] = index of gene in parent1
+    for k, gene in enumerate(parent1):
+        position1[gene] = k
+    child = [None] * n
+    from_parent1 = True
+    for start in range(n):
+        if child[start] is not None:
+            continue
+        source = parent1 if from_parent1 else parent2
+        k = start
+        while child[k] is None:
+            child[k] = source[k]
+            k = position1[parent2[k]]
+        from_parent1 = not from_parent1
+    return child
+
+
+def edge_recombination(parent1, parent2, rng=random):
+    """ERX: build a road using as much as possible the edges of the parents,
+    always moving to the neighbour that has the fewest remaining neighbours"""
+    n = len(parent1)
+    neighbours = [set() for _ in range(n)]
+    for parent in (parent1, parent2):
+        for k in range(n):
+            gene = int(parent[k])
+            neighbours[gene].add(int(parent[k - 1]))
+            neighbours[gene].add(int(parent[(k + 1) % n]))
+    unvisited = list(range(n))
+    index = list(range(n))  # index[gene] = position of gene in unvisited
+    child = []
+    current = int(parent1[0])
+    while True:
+        child.append(current)
+        # Remove current from unvisited in O(1), by moving the last one there
+        last = unvisited.pop()
+        if last != current:
+            unvisited[index[current]] = last
+            index[last] = index[current]
+        for neighbour in neighbours[current]:
+            neighbours[neighbour].discard(current)
+        if not unvisited:
+            return child
+        candidates = neighbours[current]
+        if candidates:
+            fewest = min(len(neighbours[c]) for c in candidates)
+            current = rng.choice([c for c in candidates if len(neighbours[c]) == fewest])
+        else:
+            current = rng.choice(unvisited)
+
+
+CROSSOVERS = {
+    'one_point': one_point_order_crossover,
+    'ox': order_crossover,
+    'pmx': partially_mapped_crossover,
+    'cx': cycle_crossover,
+    'erx': edge_recombination,
+}
+
+
+def _order_fill_batch(parents1, parents2, start, stop, rotate):
+    """Children keeping parents1[start:stop] in place, the other positions
+    being filled with the remaining genes in the order of parents2 (from
+    stop on, wrapping around, if rotate)"""
+    m, n = parents1.shape
+    rows = np.arange(m)[:, None]
+    columns = np.arange(n)
+    in_segment = (columns >= start[:, None]) & (columns < stop[:, None])
+    taken = np.zeros((m, n), dtype=bool)
+    taken[rows, parents1] = in_segment
+    order = (stop[:, None] + columns) % n if rotate else np.broadcast_to(columns, (m, n))
+    genes = parents2[rows, order]
+    kept = ~taken[rows, genes]
+    free = ~in_segment[rows, order]
+    # Both masks select n - (stop - start) cells per row, in the same order
+    child = np.where(in_segment, parents1, 0)
+    child[np.nonzero(free)[0], order[free]] = genes[kept]
+    return child
+
+
+def one_point_order_crossover_batch(parents1, parents2, rng):
+    """one_point_order_crossover for every row of two arrays of parents"""
+    parents1, parents2 = np.asarray(parents1), np.asarray(parents2)
+    m, n = parents1.shape
+    x_points = rng.integers(1, n, m)  # Between 1 and n - 1
+    return _order_fill_batch(parents1, parents2, np.zeros(m, dtype=int), x_points, False)
+
+
+def order_crossover_batch(parents1, parents2, rng):
+    """order_crossover for every row of two arrays of parents"""
+    parents1, parents2 = np.asarray(parents1), np.asarray(parents2)
+    m, n = parents1.shape
+    cuts = np.sort(rng.integers(0, n + 1, (m, 2)), axis=1)
+    return _order_fill_batch(parents1, parents2, cuts[:, 0], cuts[:, 1], True)
+
+
+def crossover_batch(crossover, parents1, parents2, rng=random):
+    """Apply any of the operators above to every pair of rows of parents"""
+    return np.array([crossover(a, b, rng) for a, b in zip(parents1, parents2)])
+
+
+BATCH_CROSSOVERS = {
+    'one_point': one_point_order_crossover_batch,
+    'ox': order_crossover_batch,
+}
@@ -0,0 +1,64 @@
+"""
+Selection strategies for the generic GA solver.
+
+Each strategy is a function select(population, n, rng) returning n
+Individuals of the population (possibly repeated, except for truncation) that
+survive and breed. Only truncation orders the population, and only fully when
+it keeps a large fraction of it; the others sample with replacement, drawing
+from the random generator rng (the random module by default).
+"""
+from bisect import bisect_right
+from itertools import accumulate
+import heapq
+import random
+
+
+def truncation(population, n, rng=random):
+    """Keep the n best Individuals, in descending order of fitness"""
+    if n * 10 < len(population):
+        return heapq.nlargest(n, population, key=lambda ind: ind.fitness)
+    # Keeping a large fraction: one sort in C is faster than a big heap
+    return sorted(population, key=lambda ind: ind.fitness, reverse=True)[:n]
+
+
+def tournament(population, n, rng=random, size=2):
+    """Keep the winners of n tournaments between size random Individuals"""
+    return [max(rng.choices(population, k=size), key=lambda ind: ind.fitness)
+            for _ in range(n)]
+
+
+def _cumulative_weights(population):
+    """Cumulative selection weights, proportional to the fitness shifted so
+    that the worst Individual has weight 0 (fitness can be negative)"""
+    lowest = min(ind.fitness for ind in population)
+    weights = list(accumulate(ind.fitness - lowest for ind in population))
+    if weights[-1] <= 0:  # All Individuals are equal: select uniformly
+        weights = list(range(1, len(population) + 1))
+    return weights
+
+
+def roulette(population, n, rng=random):
+    """Draw n Individuals with a probability proportional to their fitness"""
+    return rng.choices(population, cum_weights=_cumulative_weights(population), k=n)
+
+
+def stochastic_universal_sampling(population, n, rng=random):
+    """Draw n Individuals proportionally to their fitness with n evenly
+    spaced pointers, which has less variance than n roulette draws"""
+    weights = _cumulative_weights(population)
+    step = weights[-1] / n
+    start = rng.uniform(0, step)
+    selected = []
+    i = 0
+    for k in range(n):
+        i = bisect_right(weights, start + k * step, i)
+        selected.append(population[i])
+    return selected
+
+
+SELECTIONS = {
+    'truncation': truncation,
+    'tournament': tournament,
+    'roulette': roulette,
+    'sus': stochastic_universal_sampling,
+}
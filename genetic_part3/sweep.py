@@ -0,0 +1,249 @@
+"""
+Hyperparameter sweep of the generic GA solver on the Mastermind and TSP
+problems, instead of tuning them by hand.
+
+Configurations are the points of a grid, or random points of a search
+space, over pop_size, selection_rate, mutation_rate, the selection method
+and the TSP crossover operator. Each configuration is run `repeats` times
+with different seeds on the same problem instance, on a pool of worker
+processes. Successive halving stops the losing configurations early: all
+of them first run for a small number of generations, then only the best
+1/eta of them run eta times longer, and so on up to the full budget.
+
+Every run has its own seed, derived from the sweep seed, the configuration
+and the repetition, so a sweep gives the same results whatever the number
+of workers. The results are aggregated into one table per configuration,
+printed and optionally written as CSV or JSON:
+
+    python -m genetic_part3 sweep --problem tsp --size 100 --pop-sizes 50 200 \\
+        --mutation-rates 0.05 0.2 0.5 --crossovers one_point ox pmx --output sweep.csv
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import itertools
+import json
+import random
+import statistics
+import time
+
+from genetic_part1 import mastermind as mm
+from .GA_Solver_Isabela_Jose import GASolver
+from .mastermind_problem import MastermindProblem
+from .tsp_problem import TSProblem
+
+PROBLEM_OPTIONS = ('crossover_operator',)  # Given to the problem, the others to GASolver
+
+
+def grid(space):
+    """All the configurations of a search space {parameter: list of values}"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_configurations(space, n, seed=0):
+    """n random configurations of a search space: a list of values is sampled
+    uniformly, a (low, high) tuple of numbers is a uniform range"""
+    rng = random.Random(seed)
+    configurations = []
+    for _ in range(n):
+        configuration = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                configuration[name] = rng.randint(low, high) if isinstance(low, int) \
+                    else rng.uniform(low, high)
+            else:
+                configuration[name] = rng.choice(values)
+        configurations.append(configuration)
+    return configurations
+
+
+def run_seed(seed, configuration_index, repeat):
+    """Seed of one run, independent of the order the runs are scheduled in"""
+    return (seed * 1_000_003 + configuration_index) * 1009 + repeat
+
+
+def make_problem(problem_name, size, instance_seed, crossover_operator='one_point'):
+    """Return (problem, target fitness or None), the instance (Mastermind
+    secret or TSP cities) depending only on instance_seed"""
+    rng = random.Random(instance_seed)
+    if problem_name == 'mastermind':
+        match = mm.MastermindMatch(secret_size=size, rng=rng)
+        return MastermindProblem(match), match.max_score()
+    city_dict = {f"City {i}": (rng.randint(0, 1000), rng.randint(0, 1000))
+                 for i in range(size)}
+    return TSProblem(city_dict, crossover_operator=crossover_operator), None
+
+
+def run_configuration(task):
+    """Process pool task: run one configuration with one seed and return
+    its measures as a dictionary"""
+    problem_name, size, instance_seed, configuration, seed, generations = task
+    options = dict(configuration)
+    pop_size = options.pop('pop_size', 50)
+    problem_options = {name: options.pop(name) for name in PROBLEM_OPTIONS if name in options}
+    problem, target = make_problem(problem_name, size, instance_seed, **problem_options)
+    start = time.perf_counter()
+    solver = GASolver(problem, seed=seed, **options)
+    solver.reset_population(pop_size)
+    stats = solver.evolve_until(generations, threshold_fitness=target)
+    return {
+        'best_fitness': stats.best_fitness,
+        'generations': stats.generation,
+        'evaluations': solver.evaluations,
+        'seconds': time.perf_counter() - start,
+        'solved': target is not None and stats.best_fitness >= target,
+    }
+
+
+def successive_halving(problem_name, size, configurations, max_generations=200,
+                       min_generations=None, eta=3, repeats=3, seed=0, n_workers=None):
+    """Run configurations with successive halving and aggregate the results
+
+    Args:
+        problem_name (str): 'mastermind' or 'tsp'
+        size (int): secret size or number of cities
+        configurations (list[dict]): the configurations to compare
+        max_generations (int, optional): budget of the surviving configurations.
+            Defaults to 200.
+        min_generations (int, optional): budget of the first round,
+            max_generations for no early stopping. Defaults to
+            max_generations // eta**2 (three rounds).
+        eta (int, optional): factor dividing the number of configurations and
+            multiplying the budget at each round. Defaults to 3.
+        repeats (int, optional): runs per configuration and round. Defaults to 3.
+        seed (int, optional): seed of the instance and of the runs. Defaults to 0.
+        n_workers (int, optional): worker processes, 1 to run in this process.
+            Defaults to the number of processors.
+
+    Returns:
+        list[dict]: one row per configuration, best first, with the results of
+        the last round it took part in (max_generations for the best one)
+    """
+    if min_generations is None:
+        min_generations = max(max_generations // eta ** 2, 1)
+    budget = min(min_generations, max_generations)
+    alive = list(range(len(configurations)))
+    rows = {}
+    executor = ProcessPoolExecutor(n_workers) if n_workers != 1 else None
+    try:
+        while True:
+            tasks = [(problem_name, size, seed, configurations[i],
+                      run_seed(seed, i, repeat), budget)
+                     for i in alive for repeat in range(repeats)]
+            results = executor.map(run_configuration, tasks) if executor \
+                else map(run_configuration, tasks)
+            results = list(results)
+            for k, i in enumerate(alive):
+                rows[i] = aggregate(configurations[i], budget,
+                                    results[k * repeats:(k + 1) * repeats])
+            print(f"{len(alive)} configurations x {repeats} runs, {budget} generations")
+            if budget >= max_generations:
+                break
+            alive.sort(key=lambda i: _rank_key(rows[i]))
+            alive = alive[:max(1, len(alive) // eta)]
+            # The last configuration left goes straight to the full budget
+            budget = max_generations if len(alive) == 1 else min(budget * eta, max_generations)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return sorted(rows.values(), key=_rank_key)
+
+
+def _rank_key(row):
+    """Best configurations first: the most generations survived, then the
+    best mean fitness, then the fewest evaluations"""
+    return -row['budget'], -row['mean_best_fitness'], row['mean_evaluations']
+
+
+def aggregate(configuration, budget, results):
+    """One table row summarizing the runs of a configuration"""
+    best = [result['best_fitness'] for result in results]
+    row = dict(configuration)
+    row.update({
+        'budget': budget,
+        'runs': len(results),
+        'mean_best_fitness': statistics.mean(best),
+        'stdev_best_fitness': statistics.stdev(best) if len(best) > 1 else 0.0,
+        'mean_evaluations': statistics.mean(result['evaluations'] for result in results),
+        'mean_generations': statistics.mean(result['generations'] for result in results),
+        'solved_rate': sum(result['solved'] for result in results) / len(results),
+        'mean_seconds': statistics.mean(result['seconds'] for result in results),
+    })
+    return row
+
+
+def print_table(rows):
+    """Print the aggregated rows as an aligned text table"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.4g}" if isinstance(row[c], float) else str(row[c]) for c in columns]
+             for row in rows]
+    widths = [max(len(c), *(len(line[k]) for line in cells)) for k, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(cell.rjust(w) for cell, w in zip(line, widths)))
+
+
+def write_rows(rows, path):
+    """Write the aggregated rows to a CSV or JSON file, by extension"""
+    if path.endswith('.json'):
+        with open(path, 'w') as file:
+            json.dump(rows, file, indent=2)
+        return
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m genetic_part3 sweep',
+                                     description=__doc__.split('\n\n')[0])
+    parser.add_argument('--problem', default='mastermind', choices=['mastermind', 'tsp'])
+    parser.add_argument('--size', type=int, default=8,
+                        help="secret size or number of cities")
+    parser.add_argument('--pop-sizes', nargs='+', type=int, default=[50, 100])
+    parser.add_argument('--selection-rates', nargs='+', type=float, default=[0.3, 0.5])
+    parser.add_argument('--mutation-rates', nargs='+', type=float, default=[0.05, 0.1, 0.3])
+    parser.add_argument('--selections', nargs='+', default=['truncation'],
+                        choices=['truncation', 'tournament', 'roulette', 'sus'])
+    parser.add_argument('--crossovers', nargs='+', default=['one_point'],
+                        choices=['one_point', 'ox', 'pmx', 'cx', 'erx'],
+                        help="TSP crossover operators")
+    parser.add_argument('--random', type=int, default=0, metavar='N',
+                        help="sample N random configurations instead of the whole grid "
+                             "(numeric parameters range between their smallest and largest value)")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--generations', type=int, default=200, help="full budget")
+    parser.add_argument('--min-generations', type=int, default=None,
+                        help="budget of the first successive halving round "
+                             "(default: generations // eta**2)")
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="CSV or JSON file receiving the table")
+    args = parser.parse_args(argv)
+
+    space = {'pop_size': args.pop_sizes, 'selection_rate': args.selection_rates,
+             'mutation_rate': args.mutation_rates, 'selection': args.selections}
+    if args.problem == 'tsp':
+        space['crossover_operator'] = args.crossovers
+    if args.random:
+        ranges = {name: (min(values), max(values)) for name, values in space.items()
+                  if isinstance(values[0], (int, float)) and len(values) > 1}
+        configurations = random_configurations({**space, **ranges}, args.random, args.seed)
+    else:
+        configurations = grid(space)
+    rows = successive_halving(args.problem, args.size, configurations, args.generations,
+                              args.min_generations, args.eta, args.repeats, args.seed,
+                              args.workers)
+    print_table(rows)
+    if args.output:
+        write_rows(rows, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,21 +7,158 @@ Created on Thu Feb 18 2022
 Template file for your Exercise 3 submission 
 (GA solving TSP example)
 """
-from ga_solver import GAProblem
-import cities
+from array import array
+
+import numpy as np
+
+from genetic_part2 import cities
+from . import local_search, permutation_ops
+from .GA_Solver_Isabela_Jose import GAProblem
 
 class TSProblem(GAProblem):
-    """Implementation of GAProblem for the traveling salesperson problem"""
-    pass # REPLACE WITH YOUR CODE
+    """Implementation of GAProblem for the traveling salesperson problem
+
+    Chromosomes are compact arrays of city positions (see
+    cities.DistanceIndex), decoded to city names only for reporting.
+    """
+
+    def __init__(self, city_dict, crossover_operator='one_point', nb_neighbours=8,
+                 initial_roads='random'):
+        """Initializes the problem of finding the shortest road through cities
+
+        Args:
+            city_dict (dict): the cities and their coordinates, as returned by
+            cities.load_cities
+            crossover_operator (str, optional): 'one_point', 'ox', 'pmx', 'cx'
+            or 'erx' (see permutation_ops). Defaults to 'one_point'.
+            nb_neighbours (int, optional): number of nearest cities tried by the
+            local search moves of each city. Defaults to 8.
+            initial_roads (str, optional): 'random' for shuffled roads, or
+            'nearest' for nearest neighbour roads from random start cities,
+            much shorter on large instances. Defaults to 'random'.
+        """
+        if initial_roads not in ('random', 'nearest'):
+            raise ValueError(f"Unknown initial_roads {initial_roads!r}, expected 'random' or 'nearest'")
+        self.distances = cities.DistanceIndex(city_dict)
+        self.spatial_index = cities.SpatialIndex(city_dict)
+        self._initial_roads = initial_roads
+        self._typecode = 'H' if len(city_dict) <= 0x10000 else 'I'  # Smallest unsigned type that fits
+        self._crossover = permutation_ops.CROSSOVERS[crossover_operator]
+        self._crossover_batch = permutation_ops.BATCH_CROSSOVERS.get(crossover_operator)
+        self._nb_neighbours = nb_neighbours
+        self._neighbours = None  # Computed on the first local search
+
+    def generate_random_chromosome(self):
+        """Generate a random road, or a nearest neighbour road from a random city"""
+        if self._initial_roads == 'nearest':
+            start = self.rng.randrange(len(self.distances))
+            return array(self._typecode, self.spatial_index.nearest_neighbour_road(start))
+        road = array(self._typecode, range(len(self.distances)))
+        self.rng.shuffle(road)
+        return road
+
+    def calculate_fitness(self, chromosome):
+        """Negative length of the road (shorter is better)"""
+        return -self.distances.road_length(chromosome)
+
+    def calculate_fitness_batch(self, chromosomes):
+        """Negative length of every road of a matrix at once"""
+        return -self.distances.road_lengths(chromosomes)
+
+    def crossover(self, parent1, parent2):
+        """Cross two roads with the chosen permutation operator"""
+        return array(self._typecode, self._crossover(parent1, parent2, self.rng))
+
+    def crossover_batch(self, parents1, parents2):
+        """Cross every pair of rows at once, when the operator has an array version"""
+        if self._crossover_batch is None:
+            return permutation_ops.crossover_batch(self._crossover, parents1, parents2,
+                                                   self.rng)
+        return self._crossover_batch(parents1, parents2, self.np_rng)
+
+    def mutate_batch(self, chromosomes):
+        """Swap two random cities of every road of a matrix at once"""
+        mutated = np.array(chromosomes)
+        m, n = mutated.shape
+        rows, rng = np.arange(m), self.np_rng
+        i = rng.integers(0, n, m)
+        j = rng.integers(0, n - 1, m)
+        j += j >= i  # Two distinct indices
+        mutated[rows, i], mutated[rows, j] = mutated[rows, j], mutated[rows, i]
+        return mutated
+
+    mutation_operators = ('swap', 'inversion', 'two_opt')
+
+    def mutate(self, chromosome):
+        """Swap two random cities of the road"""
+        return self.mutate_with_move(chromosome)[0]
+
+    def mutate_with_move(self, chromosome, operator=None):
+        """Mutate a road with one of the operators:
+        - 'swap' (default): swap two random cities,
+        - 'inversion': reverse a random segment of the road,
+        - 'two_opt': reverse the segment that makes a random city the
+          neighbour of one of its nearest cities.
+        The move is (operator, i, j), i and j being the swapped indices or the
+        first and last indices of the reversed segment.
+        """
+        mutated = array(self._typecode, chromosome)
+        if operator in (None, 'swap'):
+            i, j = self.rng.sample(range(len(mutated)), 2)
+            mutated[i], mutated[j] = mutated[j], mutated[i]
+            return mutated, ('swap', i, j)
+        if operator == 'inversion':
+            i, j = sorted(self.rng.sample(range(len(mutated)), 2))
+        else:
+            i = self.rng.randrange(len(mutated))
+            j = mutated.index(self.rng.choice(self._neighbour_lists()[mutated[i]]))
+            i, j = min(i, j) + 1, max(i, j)  # New edges: (road[i], road[j]) and the next ones
+            if i >= j:
+                return mutated, ('inversion', i, i)  # Already neighbours
+        mutated[i:j + 1] = mutated[j:i - 1 if i else None:-1]
+        return mutated, ('inversion', i, j)
+
+    def fitness_delta(self, chromosome, move):
+        """Only the (at most 4) edges around the moved cities change, and a
+        local search move carries its change of length"""
+        if move[0] == 'local_search':
+            return -move[1]
+        operator, i, j = move
+        if operator == 'swap':
+            return -self.distances.swap_delta(chromosome, i, j)
+        return -self.distances.two_opt_delta(chromosome, i, j)
+
+    def _neighbour_lists(self):
+        """Nearest cities of each city, computed once"""
+        if self._neighbours is None:
+            self._neighbours = self.spatial_index.neighbour_lists(self._nb_neighbours)
+        return self._neighbours
+
+    def local_search(self, chromosome):
+        """Improve a road with 2-opt and Or-opt moves (see local_search)"""
+        return self.local_search_with_move(chromosome)[0]
+
+    def local_search_with_move(self, chromosome):
+        """Same as local_search, the move being ('local_search', change of
+        length of the road)"""
+        road = list(chromosome)
+        change = local_search.improve(road, self.distances, self._neighbour_lists())
+        return array(self._typecode, road), ('local_search', change)
+
+    def decode(self, chromosome):
+        """Return the road of a chromosome as a list of city names"""
+        return self.distances.decode_road(chromosome)
 
 
 if __name__ == '__main__':
 
-    from ga_solver import GASolver
+    import os
+    from .GA_Solver_Isabela_Jose import GASolver
 
-    city_dict = cities.load_cities("cities.txt")
-    problem = TSProblem()
+    # cities.txt comes with the cities module
+    city_dict = cities.load_cities(os.path.join(os.path.dirname(cities.__file__), "cities.txt"))
+    problem = TSProblem(city_dict)
     solver = GASolver(problem)
     solver.reset_population()
-    solver.evolve_until()
-    cities.draw_cities(city_dict, solver.getBestIndiv().chromosome)
+    solver.evolve_until(log_every=50)
+    cities.draw_cities(city_dict, problem.decode(solver.get_best_individual().chromosome))
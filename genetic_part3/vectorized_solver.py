@@ -0,0 +1,217 @@
+"""
+Vectorized population engine for the generic GA solver.
+
+Instead of a list of Individual objects, the population is stored as one
+2-D integer array (one chromosome per row) and one 1-D array of fitness
+values, and every generation is computed with array operations through the
+batch hooks of GAProblem (calculate_fitness_batch, crossover_batch and
+mutate_batch). Problems that only implement the per-chromosome methods still
+work, through the default batch hooks that loop over the rows.
+"""
+from array import array
+
+import numpy as np
+
+from .GA_Solver_Isabela_Jose import GAProblem, GASolver, Individual, timed
+from .generation_stats import GenerationStats
+
+
+# Array versions of the selection strategies of the selection module: each
+# one is a function select(fitness, n, rng) returning the indices of n
+# chromosomes, from a 1-D fitness array and a numpy random Generator
+
+def truncation(fitness, n, rng):
+    """Indices of the n best chromosomes, in no particular order"""
+    return np.argpartition(-fitness, n - 1)[:n]
+
+
+def tournament(fitness, n, rng, size=2):
+    """Indices of the winners of n tournaments between size random chromosomes"""
+    contenders = rng.integers(0, len(fitness), (n, size))
+    return contenders[np.arange(n), fitness[contenders].argmax(axis=1)]
+
+
+def _cumulative_weights(fitness):
+    """Cumulative selection weights, proportional to the fitness shifted so
+    that the worst chromosome has weight 0 (fitness can be negative)"""
+    weights = np.cumsum(fitness - fitness.min())
+    if weights[-1] <= 0:  # All chromosomes are equal: select uniformly
+        weights = np.arange(1, len(fitness) + 1, dtype=float)
+    return weights
+
+
+def roulette(fitness, n, rng):
+    """Indices of n chromosomes drawn with a probability proportional to their fitness"""
+    weights = _cumulative_weights(fitness)
+    drawn = np.searchsorted(weights, rng.random(n) * weights[-1], side='right')
+    return np.minimum(drawn, len(fitness) - 1)
+
+
+def stochastic_universal_sampling(fitness, n, rng):
+    """Indices of n chromosomes drawn proportionally to their fitness with n
+    evenly spaced pointers"""
+    weights = _cumulative_weights(fitness)
+    step = weights[-1] / n
+    pointers = rng.uniform(0, step) + step * np.arange(n)
+    drawn = np.searchsorted(weights, pointers, side='right')
+    return np.minimum(drawn, len(fitness) - 1)
+
+
+ARRAY_SELECTIONS = {
+    'truncation': truncation,
+    'tournament': tournament,
+    'roulette': roulette,
+    'sus': stochastic_universal_sampling,
+}
+
+
+class VectorizedGASolver(GASolver):
+    def __init__(self, problem: GAProblem, selection_rate=0.5, mutation_rate=0.1,
+                 dtype=np.int32, selection='truncation', instrumentation=None,
+                 seed=None):
+        """Initializes an instance of a vectorized GA solver for a given problem
+
+        Args:
+            problem (GAProblem): An instance of a GAProblem to solve, whose
+                chromosomes are fixed-length sequences of integers
+            selection_rate (float, optional): Selection rate between 0 and 1.0. Defaults to 0.5.
+            mutation_rate (float, optional): Mutation rate between 0 and 1.0. Defaults to 0.1.
+            dtype (numpy.dtype, optional): Integer type of the genes. Defaults to numpy.int32.
+            selection (str or callable, optional): 'truncation', 'tournament',
+                'roulette', 'sus' or a function select(fitness, n, rng) returning
+                the indices of the survivors. The best chromosome always survives.
+                Defaults to 'truncation'.
+            instrumentation (instrumentation.Instrumentation, optional): See
+                GASolver. Defaults to None.
+            seed (int or numpy.random.SeedSequence, optional): See GASolver.
+                Defaults to None.
+        """
+        super().__init__(problem, selection_rate, mutation_rate, instrumentation=instrumentation,
+                         seed=seed)
+        self._dtype = dtype
+        self._select_indices = ARRAY_SELECTIONS[selection] if isinstance(selection, str) \
+            else selection
+        self._chromosomes = np.empty((0, 0), dtype=dtype)
+        self._fitness = np.empty(0)
+
+    def reset_population(self, pop_size=50):
+        """Initialize the population with pop_size random chromosomes"""
+        chromosomes = [self.problem.generate_random_chromosome() for _ in range(pop_size)]
+        self._chromosomes = np.asarray(chromosomes, dtype=self._dtype)
+        self._fitness = self._evaluate(self._chromosomes)
+        self._generation = 0
+
+    def evolve_for_one_generation(self):
+        """Apply the process for one generation, on the whole population at once:
+        - Selection: Keep a fraction of the population (see selection)
+        - Reproduction: Cross random pairs of distinct survivors
+        - Mutation: Mutate each child with probability mutation_rate
+        """
+        pop_size = len(self._fitness)
+        survivors = int(self._selection_rate * pop_size)
+
+        # Selection: Keep a fraction, always including the best chromosome
+        with self._phase('selection'):
+            order = self._select_indices(self._fitness, survivors, self._np_rng)
+            best = np.argmax(self._fitness)
+            if not (order == best).any():
+                order[-1] = best
+            parents = self._chromosomes[order]
+            parents_fitness = self._fitness[order]
+
+        # Reproduction: Draw two distinct parents for every child
+        nb_children = pop_size - survivors
+        with self._phase('crossover'):
+            idx_a = self._np_rng.integers(0, survivors, nb_children)
+            idx_b = self._np_rng.integers(0, survivors - 1, nb_children)
+            idx_b += idx_b >= idx_a
+            children = self._as_chromosomes(
+                self.problem.crossover_batch(parents[idx_a], parents[idx_b]))
+        self._count_chromosomes(nb_children)
+        children_fitness = self._evaluate(children)
+
+        # Mutation: Only children are mutated, never the parents
+        with self._phase('mutation'):
+            mutants = self._np_rng.random(nb_children) < self._mutation_rate
+            mutated = None
+            if mutants.any():
+                mutated = self._as_chromosomes(self.problem.mutate_batch(children[mutants]))
+                children[mutants] = mutated
+        if mutated is not None:
+            self._count_chromosomes(len(mutated))
+            children_fitness[mutants] = self._evaluate(mutated)
+
+        with self._phase('replacement'):
+            self._chromosomes = np.concatenate((parents, children))
+            self._fitness = np.concatenate((parents_fitness, children_fitness))
+        self._generation += 1
+
+    @property
+    def population(self):
+        """The list of the Individuals of the population, built from copies of
+        its rows: changing them does not change the population"""
+        return [Individual(chromosome, fitness) for chromosome, fitness
+                in zip(self._chromosomes.copy(), self._fitness.tolist())]
+
+    def get_best_individual(self):
+        """Return the best Individual of the population"""
+        best = int(np.argmax(self._fitness))
+        return Individual(self._chromosomes[best].copy(), float(self._fitness[best]))
+
+    def _generation_stats(self, duration, track_diversity):
+        """Summarize the population with array reductions"""
+        diversity = unique = entropy = None
+        if track_diversity:
+            unique = len(np.unique(self._chromosomes, axis=0))
+            diversity = unique / len(self._fitness)
+            entropy = 0.0
+            for genes in self._chromosomes.T:  # Entropy of each gene position
+                p = np.unique(genes, return_counts=True)[1] / len(genes)
+                entropy -= float((p * np.log2(p)).sum())
+            entropy /= max(self._chromosomes.shape[1], 1)
+        best = self.get_best_individual()
+        return GenerationStats(self._generation, best, best.fitness,
+                               float(self._fitness.mean()), diversity, duration,
+                               unique, entropy)
+
+    def get_top_individuals(self, n):
+        """Return the n best Individuals of the population"""
+        n = min(n, len(self._fitness))
+        best = np.argpartition(-self._fitness, n - 1)[:n] if n else []
+        return [Individual(self._chromosomes[i].copy(), float(self._fitness[i])) for i in best]
+
+    def replace_worst(self, individuals):
+        """Replace the worst chromosomes of the population by the ones of the
+        given Individuals (e.g. migrants coming from another population)"""
+        n = min(len(individuals), len(self._fitness))
+        if n == 0:
+            return
+        worst = np.argpartition(self._fitness, n - 1)[:n]
+        self._chromosomes[worst] = self._as_chromosomes([ind.chromosome for ind in individuals[:n]])
+        self._fitness[worst] = [ind.fitness for ind in individuals[:n]]
+
+    def _snapshot(self):
+        """Copy the population to flat arrays: (typecode, chromosome length,
+        genes, fitness)"""
+        typecode = np.dtype(self._dtype).char
+        genes = array(typecode)
+        genes.frombytes(self._chromosomes.tobytes())
+        fitness = array('d')
+        fitness.frombytes(self._fitness.astype(float).tobytes())
+        return typecode, self._chromosomes.shape[1], genes, fitness
+
+    def _restore(self, typecode, length, genes, fitness):
+        """Rebuild the population arrays from the flat arrays of _snapshot"""
+        genes = np.frombuffer(genes, dtype=typecode).reshape(len(fitness), length)
+        self._chromosomes = genes.astype(self._dtype)
+        self._fitness = np.frombuffer(fitness, dtype=float).copy()
+
+    def _as_chromosomes(self, chromosomes):
+        """Convert the result of a batch hook to a 2-D gene array"""
+        return np.asarray(chromosomes, dtype=self._dtype)
+
+    @timed('evaluation')
+    def _evaluate(self, chromosomes):
+        """Score every row of chromosomes with the problem's batch fitness"""
+        self._evaluations += len(chromosomes)
+        return np.asarray(self.problem.calculate_fitness_batch(chromosomes), dtype=float)
@@ -0,0 +1,44 @@
+"""Make the lab packages (genetic_part1, genetic_part2 and genetic_part3)
+importable from the repository root, and share the problem factories."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from genetic_part1 import mastermind as mm  # noqa: E402
+from genetic_part3.mastermind_problem import MastermindProblem  # noqa: E402
+from genetic_part3.tsp_problem import TSProblem  # noqa: E402
+
+
+@pytest.fixture
+def random_cities():
+    """Factory of n cities with random coordinates, drawn from seed"""
+    def make(n, seed):
+        rng = random.Random(seed)
+        return {f"City {i}": (rng.randint(0, 1000), rng.randint(0, 1000)) for i in range(n)}
+    return make
+
+
+@pytest.fixture
+def tsp_problem(random_cities):
+    """Factory of TSProblems on n random cities"""
+    def make(n=30, **options):
+        return TSProblem(random_cities(n, n), **options)
+    return make
+
+
+@pytest.fixture
+def mastermind_problem():
+    """Factory of MastermindProblems on a secret of the given size"""
+    def make(size=8):
+        return MastermindProblem(mm.MastermindMatch(secret_size=size, rng=random.Random(size)))
+    return make
+
+
+@pytest.fixture(params=['tsp_problem', 'mastermind_problem'])
+def make_problem(request):
+    """Each of the problem factories"""
+    return request.getfixturevalue(request.param)
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from genetic_part3 import checkpoint
+from genetic_part3.GA_Solver_Isabela_Jose import GASolver
+from genetic_part3.vectorized_solver import VectorizedGASolver
+
+
+def population(solver):
+    return [(list(individual.chromosome), individual.fitness)
+            for individual in solver.population]
+
+
+def test_checkpoint_round_trip(tmp_path, tsp_problem):
+    solver = GASolver(tsp_problem(), seed=0, cache_size=100)
+    solver.reset_population(30)
+    solver.evolve_until(5)
+    saved = solver.checkpoint()
+    checkpoint.save(tmp_path / 'run.ckpt', saved)
+    assert checkpoint.load(tmp_path / 'run.ckpt') == saved
+
+
+@pytest.mark.parametrize('solver_class', [GASolver, VectorizedGASolver])
+def test_resume_continues_identically(tmp_path, solver_class, make_problem):
+    path = tmp_path / 'run.ckpt'
+    solver = solver_class(make_problem(), seed=1)
+    solver.reset_population(30)
+    solver.evolve_until(10)
+    solver.save_checkpoint(path)
+    solver.evolve_until(10)
+
+    resumed = solver_class(make_problem(), seed=2)
+    resumed.resume(path)
+    assert resumed.generation == 10
+    resumed.evolve_until(10)
+    assert resumed.generation == solver.generation
+    assert len(population(solver)) == 30
+    assert population(resumed) == population(solver)
+
+
+@pytest.mark.parametrize('solver_class', [GASolver, VectorizedGASolver])
+def test_generation_counts_direct_evolution(tmp_path, solver_class, tsp_problem):
+    solver = solver_class(tsp_problem(), seed=0)
+    solver.reset_population(20)
+    for _ in range(5):
+        solver.evolve_for_one_generation()
+    assert solver.generation == solver.checkpoint().generation == 5
+    solver.save_checkpoint(tmp_path / 'run.ckpt')
+    resumed = solver_class(tsp_problem(), seed=1)
+    resumed.resume(tmp_path / 'run.ckpt')
+    assert resumed.generation == 5
+
+
+@pytest.mark.parametrize('solver_class', [GASolver, VectorizedGASolver])
+def test_random_seed_makes_unseeded_runs_reproducible(solver_class, make_problem):
+    runs = []
+    for _ in range(2):
+        random.seed(0)
+        solver = solver_class(make_problem())
+        solver.reset_population(30)
+        solver.evolve_until(10)
+        runs.append(population(solver))
+    assert runs[0] == runs[1]
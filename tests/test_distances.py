@@ -0,0 +1,78 @@
+import pickle
+import random
+
+import pytest
+
+from genetic_part2 import cities
+
+
+def swapped(road, i, j):
+    road = list(road)
+    road[i], road[j] = road[j], road[i]
+    return road
+
+
+def reversed_segment(road, i, j):
+    return road[:i] + road[i:j + 1][::-1] + road[j + 1:]
+
+
+# Dense matrix, float32 upper triangle, and no stored matrix
+STORAGES = [{}, {'dense_limit': 10}, {'dense_limit': 10, 'matrix_limit': 10}]
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+@pytest.mark.parametrize('n', [4, 5, 30])
+def test_swap_and_two_opt_deltas_match_road_length(random_cities, storage, n):
+    distances = cities.DistanceIndex(random_cities(n, n), **storage)
+    rng = random.Random(n)
+    road = list(range(n))
+    rng.shuffle(road)
+    length = distances.road_length(road)
+    for i in range(n):
+        for j in range(n):
+            assert distances.swap_delta(road, i, j) == pytest.approx(
+                distances.road_length(swapped(road, i, j)) - length, abs=1e-3)
+            if i <= j:
+                assert distances.two_opt_delta(road, i, j) == pytest.approx(
+                    distances.road_length(reversed_segment(road, i, j)) - length, abs=1e-3)
+
+
+@pytest.mark.parametrize('storage', STORAGES)
+def test_road_length_matches_city_names(random_cities, storage):
+    city_dict = random_cities(20, 0)
+    distances = cities.DistanceIndex(city_dict, **storage)
+    road = cities.default_road(city_dict)
+    assert distances.road_length(distances.encode_road(road)) == pytest.approx(
+        cities.road_length(city_dict, road), abs=1e-3)
+
+
+def test_city_arrays_match_city_dict(tmp_path, random_cities):
+    city_dict = random_cities(200, 1)
+    cities.save_cities(city_dict, tmp_path / 'cities.txt')
+    city_arrays = cities.load_city_arrays(str(tmp_path / 'cities.txt'))
+    assert city_arrays.to_dict() == city_dict
+    cached = str(tmp_path / 'cities.cache')
+    cities.load_city_arrays(str(tmp_path / 'cities.txt'), cache=cached)
+    city_arrays = cities.load_city_arrays(str(tmp_path / 'cities.txt'), cache=cached)
+    assert city_arrays.to_dict() == city_dict
+
+    road = list(range(200))
+    random.Random(1).shuffle(road)
+    for storage in STORAGES:
+        assert cities.DistanceIndex(city_arrays, **storage).road_length(road) == \
+            pytest.approx(cities.DistanceIndex(city_dict, **storage).road_length(road))
+    from_arrays, from_dict = cities.SpatialIndex(city_arrays), cities.SpatialIndex(city_dict)
+    assert from_arrays.neighbour_lists(5) == from_dict.neighbour_lists(5)
+    assert from_arrays.nearest_neighbour_road() == from_dict.nearest_neighbour_road()
+    assert from_arrays.within((500, 500), 150) == from_dict.within((500, 500), 150)
+
+
+def test_indexes_survive_pickling(tmp_path, random_cities):
+    city_dict = random_cities(30, 2)
+    cities.save_cities(city_dict, tmp_path / 'cities.txt')
+    for city_source in (city_dict, cities.load_city_arrays(str(tmp_path / 'cities.txt'))):
+        distances = cities.DistanceIndex(city_source, dense_limit=10, matrix_limit=10)
+        assert pickle.loads(pickle.dumps(distances)).between(3, 7) == distances.between(3, 7)
+        spatial_index = cities.SpatialIndex(city_source)
+        assert pickle.loads(pickle.dumps(spatial_index)).nearest((500, 500), 5) == \
+            spatial_index.nearest((500, 500), 5)
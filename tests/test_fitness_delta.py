@@ -0,0 +1,40 @@
+import pytest
+
+from genetic_part3.GA_Solver_Isabela_Jose import GASolver
+
+
+def test_fitness_delta_matches_recomputed_fitness(make_problem):
+    problem = make_problem()
+    problem.seed(0)
+    for operator in (None,) + problem.mutation_operators:
+        for _ in range(200):
+            chromosome = problem.generate_random_chromosome()
+            mutated, move = problem.mutate_with_move(chromosome, operator)
+            assert problem.fitness_delta(chromosome, move) == pytest.approx(
+                problem.calculate_fitness(mutated) - problem.calculate_fitness(chromosome),
+                abs=1e-6)
+
+
+@pytest.mark.parametrize('generational_gap', [None, 0.2])
+def test_incremental_fitness_stays_exact(make_problem, generational_gap):
+    problem = make_problem()
+    solver = GASolver(problem, mutation_rate=0.5, generational_gap=generational_gap, seed=0)
+    solver.reset_population(40)
+    solver.evolve_until(30)
+    assert solver.delta_evaluations > 0
+    for individual in solver.population:
+        assert individual.fitness == pytest.approx(
+            problem.calculate_fitness(individual.chromosome), abs=1e-6)
+
+
+@pytest.mark.parametrize('generational_gap', [None, 0.2])
+def test_local_search_fitness_stays_exact(tsp_problem, generational_gap):
+    problem = tsp_problem(60)
+    solver = GASolver(problem, mutation_rate=0.0, memetic_rate=0.5,
+                      generational_gap=generational_gap, seed=0)
+    solver.reset_population(20)
+    solver.evolve_until(10)
+    assert solver.delta_evaluations > 0
+    for individual in solver.population:
+        assert individual.fitness == pytest.approx(
+            problem.calculate_fitness(individual.chromosome), abs=1e-6)
@@ -0,0 +1,31 @@
+import random
+from collections import Counter
+
+import pytest
+
+from genetic_part1 import mastermind as mm
+
+
+def reference_feedback(secret, guess):
+    """Black and white pegs counted on the color strings"""
+    black = sum(s == g for s, g in zip(secret, guess))
+    common = sum((Counter(secret) & Counter(guess)).values())
+    return black, common - black
+
+
+@pytest.mark.parametrize('size', [1, 4, 6, 10])
+@pytest.mark.parametrize('points', [(1, 3), (2, 5)])
+def test_integer_scores_match_rate_guess(size, points):
+    secret = mm.generate_random_secret(size, random.Random(size))
+    rng = random.Random(size)
+    match = mm.MastermindMatch(size, *points, rng=rng)
+    assert match.is_correct(secret)
+    guesses = [match.generate_random_guess(rng) for _ in range(300)]
+    expected = [match.rate_guess(guess) for guess in guesses]
+    encoded = [mm.encode_guess(guess) for guess in guesses]
+    assert [match.rate_encoded_guess(guess) for guess in encoded] == expected
+    assert match.rate_guesses(encoded).tolist() == expected
+    for guess, encoded_guess in zip(guesses, encoded):
+        assert sum(match.peg_score(i, color) for i, color in enumerate(encoded_guess)) == \
+            match.rate_guess(guess)
+        assert match.feedback(encoded_guess) == reference_feedback(secret, guess)
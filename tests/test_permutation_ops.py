@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pytest
+
+from genetic_part3 import permutation_ops
+
+
+def is_permutation(child, n):
+    return sorted(int(gene) for gene in child) == list(range(n))
+
+
+@pytest.mark.parametrize('name', sorted(permutation_ops.CROSSOVERS))
+@pytest.mark.parametrize('n', [2, 3, 8, 50])
+def test_crossovers_return_permutations(name, n):
+    crossover = permutation_ops.CROSSOVERS[name]
+    rng = random.Random(n)
+    for _ in range(50):
+        parent1, parent2 = list(range(n)), list(range(n))
+        rng.shuffle(parent1)
+        rng.shuffle(parent2)
+        assert is_permutation(crossover(parent1, parent2, rng), n)
+
+
+def test_crossover_of_identical_parents_is_the_parent():
+    parent = list(range(10))
+    random.Random(0).shuffle(parent)
+    for crossover in permutation_ops.CROSSOVERS.values():
+        assert list(crossover(parent, parent, random.Random(1))) == parent
+
+
+@pytest.mark.parametrize('name', sorted(permutation_ops.CROSSOVERS))
+@pytest.mark.parametrize('n', [2, 3, 8, 50])
+def test_batch_crossovers_return_permutations(name, n):
+    rng = np.random.default_rng(n)
+    parents1 = np.array([rng.permutation(n) for _ in range(40)])
+    parents2 = np.array([rng.permutation(n) for _ in range(40)])
+    batch = permutation_ops.BATCH_CROSSOVERS.get(name)
+    if batch is None:
+        children = permutation_ops.crossover_batch(permutation_ops.CROSSOVERS[name],
+                                                   parents1, parents2, random.Random(n))
+    else:
+        children = batch(parents1, parents2, rng)
+    assert children.shape == parents1.shape
+    assert all(is_permutation(child, n) for child in children)
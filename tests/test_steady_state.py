@@ -0,0 +1,27 @@
+from collections import Counter
+
+from genetic_part3.GA_Solver_Isabela_Jose import GASolver
+
+
+def test_replace_in_place_keeps_its_bookkeeping(make_problem):
+    problem = make_problem()
+    solver = GASolver(problem, mutation_rate=0.3, generational_gap=0.2,
+                      suppress_duplicates=True, seed=0)
+    solver.reset_population(40)
+    initial = {id(individual) for individual in solver.population}
+    for _ in range(30):
+        solver.evolve_for_one_generation()
+        population = solver.population
+        identities = {id(individual) for individual in population}
+
+        heap = solver._heap
+        assert all(heap[k] <= heap[child] for k in range(len(heap))
+                   for child in (2 * k + 1, 2 * k + 2) if child < len(heap))
+        assert sorted(heap) == sorted((individual.fitness, i)
+                                      for i, individual in enumerate(population))
+
+        assert len(identities) == len(population)
+        assert not identities & {id(spare) for spare in solver._spare}
+        assert solver._fingerprints == Counter(problem.fingerprint(individual.chromosome)
+                                               for individual in population)
+    assert identities != initial  # Children did replace Individuals
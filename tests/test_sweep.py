@@ -0,0 +1,15 @@
+from genetic_part3 import sweep
+
+
+def test_successive_halving_runs_the_winner_to_the_full_budget(capsys):
+    configurations = sweep.grid({'pop_size': [10], 'mutation_rate': [0.05, 0.1, 0.3],
+                                 'selection_rate': [0.3, 0.5, 0.7]})
+    rows = sweep.successive_halving('tsp', 10, configurations, max_generations=27,
+                                    n_workers=1, repeats=1)
+    assert capsys.readouterr().out.splitlines() == [
+        "9 configurations x 1 runs, 3 generations",
+        "3 configurations x 1 runs, 9 generations",
+        "1 configurations x 1 runs, 27 generations",
+    ]
+    assert [row['budget'] for row in rows] == [27, 9, 9, 3, 3, 3, 3, 3, 3]
+    assert rows[0]['mean_generations'] == 27